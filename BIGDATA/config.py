@@ -0,0 +1,84 @@
+"""
+Zajednička podešavanja aplikacije i komande za treniranje.
+Putanje su relativne u odnosu na BIGDATA direktorijum (odatle se pokreću main.py i treniranje).
+"""
+
+# Izvor podataka (CSV ostaje jedini izvor istine koji se ručno uređuje)
+DATA_PATH = 'dataset/Data_Cacak.csv'
+
+# Direktorijum u kome se čuvaju istrenirani modeli (verzije + pokazivač na poslednju)
+ARTIFACTS_DIR = 'artifacts'
+
+# Regresor: 'random_forest' (RandomForestRegressor sa MODEL_PARAMS) ili 'hist_gradient_boosting'
+# (HistGradientBoostingRegressor sa HGB_PARAMS - deli ulaze u binove jednom, trenira u više niti i
+# daje mnogo manji model od šume sa 100 dubokih stabala, što je bitno za skup od više miliona redova)
+MODEL_BACKEND = 'random_forest'
+
+# Hiperparametri modela i podele podataka - ulaze u heš verzije modela
+MODEL_PARAMS = {
+    'n_estimators': 100,
+    'random_state': 42,
+}
+HGB_PARAMS = {
+    'max_iter': 300,
+    'learning_rate': 0.1,
+    'random_state': 42,
+}
+# HGB nema ugrađenu važnost parametara: računa se permutaciona važnost na test skupu (broj ponavljanja)
+PERMUTATION_IMPORTANCE_REPEATS = 5
+TEST_SIZE = 0.2
+SPLIT_RANDOM_STATE = 42
+
+# Treniranje nad memorijski mapiranim float32 matricama (bez DataFrame-a i kopija iz train_test_split)
+USE_MEMMAP = True
+
+# Broj jezgara za treniranje (None = sva jezgra). Modeli lokacija se treniraju paralelno u posebnim
+# procesima, a preostala jezgra koristi svaka šuma za paralelno građenje stabala.
+# Manji budžet ostavlja jezgra slobodna za web aplikaciju koja radi na istoj mašini.
+TRAIN_WORKERS = None
+
+# Pozadinsko ponovno treniranje posle dodavanja novih mjerenja (/add):
+# trening se pokreće kada se skupi RETRAIN_MIN_NEW_ROWS novih redova (24 = dan satnih podataka)
+# ili kada najstariji neobrađeni red čeka duže od RETRAIN_MAX_AGE_SECONDS.
+RETRAIN_MIN_NEW_ROWS = 24
+RETRAIN_MAX_AGE_SECONDS = 6 * 60 * 60
+RETRAIN_CHECK_INTERVAL_SECONDS = 60
+# Manji budžet jezgara, da trening ne uspori web aplikaciju
+RETRAIN_WORKERS = 2
+
+# Keš rezultata predikcije (predikcije i graf po verziji modela i ulaznom redu)
+PREDICTION_CACHE_SIZE = 256
+PREDICTION_CACHE_TTL_SECONDS = 60 * 60
+
+# Grupni unos mjerenja (/api/measurements): broj redova po delu koji se validira odjednom
+# i najveći broj odbijenih redova koji se navodi u odgovoru
+INGEST_CHUNK_ROWS = 10000
+INGEST_MAX_REPORTED_ROWS = 100
+# Mjerenje za vreme koje već postoji: 'reject' (odbija se) ili 'upsert' (upisuje se kao ispravka, važi poslednji upis)
+INGEST_ON_DUPLICATE = 'reject'
+
+# Posle treniranja se StandardScaler ugrađuje u pragove stabala (stabla zavise samo od redosleda vrednosti),
+# pa sačuvani model predviđa bez skaliranja, sa identičnim rezultatima
+FOLD_SCALER = True
+
+# Predikcija preko ravnog zapisa šuma (NumPy nizovi, pragovi sa ugrađenim StandardScaler-om).
+# Isti rezultati kao sklearn, a jedan red se računa ~20x brže; grupe veće od FLAT_FOREST_MAX_ROWS
+# redova idu kroz sklearn, koji je za velike grupe brži.
+USE_FLAT_FOREST = True
+FLAT_FOREST_MAX_ROWS = 128
+
+# Profili za posluživanje (python -m models.serving_profiles): izmene MODEL_PARAMS za manje šume.
+# n_estimators je najveći broj stabala; stvarni broj se bira po lokaciji krivom validacije.
+SERVING_PROFILES = {
+    'pruned': {'max_depth': 16, 'min_samples_leaf': 3},
+    'compact': {'n_estimators': 50, 'max_depth': 10, 'min_samples_leaf': 10},
+}
+# Dozvoljeno relativno povećanje validacione MAE za manji model (0.01 = 1%) i udeo trening skupa za validaciju
+SERVING_MAE_TOLERANCE = 0.01
+SERVING_VALIDATION_SIZE = 0.2
+
+# Prognoza za naredne sate (/api/forecast): podrazumevani i najveći broj sati, i broj poslednjih dana
+# mjerenja iz kojih se procenjuju vremenski podaci kada prognoza vremena nije poslata
+FORECAST_DEFAULT_HOURS = 24
+FORECAST_MAX_HOURS = 48
+FORECAST_HISTORY_DAYS = 7
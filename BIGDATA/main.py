@@ -1,13 +1,181 @@
-from flask import Flask, request, render_template, redirect, url_for
-from models.train_model import (model_location_1, model_location_2, model_location_3)
-from models.data_preprocessing import load_and_preprocess_data
+from flask import Flask, request, render_template, redirect, url_for, jsonify, Response, send_file, make_response
+from models.train_model import train_and_save, retrain_version
+from models.model_registry import ModelRegistry
+from models.dataset_cache import DatasetCache
+from models.data_preprocessing import (features_to_matrix, prepare_feature_rows, read_time_range,
+                                      DATASET_COLUMNS, DATETIME_COLUMN, FEATURE_COLUMNS, TARGET_COLUMNS)
+from models.validation import error_messages
+from models.model_store import artifact_path, save_artifact_json
+from models.retraining import RetrainingScheduler
+from models.prediction_cache import PredictionCache, feature_key
+from models.forecast import forecast, weather_from_history
+from models.ingest import (ingest_batches, iter_csv_batches, iter_json_batches, iter_ndjson_batches,
+                           ON_DUPLICATE_REJECT, ON_DUPLICATE_UPSERT)
+from config import (DATA_PATH, ARTIFACTS_DIR, RETRAIN_MIN_NEW_ROWS, RETRAIN_MAX_AGE_SECONDS,
+                    RETRAIN_CHECK_INTERVAL_SECONDS, RETRAIN_WORKERS, PREDICTION_CACHE_SIZE,
+                    PREDICTION_CACHE_TTL_SECONDS, INGEST_CHUNK_ROWS, INGEST_MAX_REPORTED_ROWS,
+                    INGEST_ON_DUPLICATE, FORECAST_DEFAULT_HOURS, FORECAST_MAX_HOURS)
+import numpy as np
 import pandas as pd
+import plotly
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs_version
+import gzip
+import hashlib
+import json
 import os
 import sys
+import threading
+
+try:
+    import brotli  # Opciono: brotli kompresija ako je paket instaliran (pip install brotli)
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 
+# Registar modela - učitava sačuvanu verziju (trening se pokreće zasebno: python -m models.train_model)
+model_registry = ModelRegistry(ARTIFACTS_DIR)
+try:
+    model_registry.load_latest()
+except FileNotFoundError:
+    # Prvo pokretanje bez artefakata - modeli se treniraju jednom i čuvaju za sledeća pokretanja
+    print("Sačuvani modeli nisu pronađeni, pokreće se jednokratno treniranje...")
+    train_and_save()
+    model_registry.load_latest()
+
+# Pozadinsko ponovno treniranje kada se skupi dovoljno novih mjerenja: sa podešavanjima aktivne verzije
+# (npr. model sa više izlaza ili HGB ostaje to što jeste), a nova verzija se aktivira preko registra
+# (isto zaključavanje kao učitavanje verzije iz LATEST, pa se ne učitava dvaput)
+retraining_scheduler = RetrainingScheduler(
+    train_fn=lambda: retrain_version(model_registry.current.metadata, workers=RETRAIN_WORKERS),
+    on_new_models=model_registry.load_version,
+    min_new_rows=RETRAIN_MIN_NEW_ROWS,
+    max_age_seconds=RETRAIN_MAX_AGE_SECONDS,
+    check_interval=RETRAIN_CHECK_INTERVAL_SECONDS,
+)
+
+def get_model_set():
+    """
+    Aktivni skup modela za tekući zahtev (nova verzija sa diska se učitava u pozadini).
+    """
+    model_registry.reload_if_updated()
+    return model_registry.current
+
+# plotly.js se servira lokalno iz plotly paketa, jednom po stranici, i kešira u pregledaču
+# (verzija je u URL-u, pa se nova verzija plotly-ja preuzima automatski)
+PLOTLY_JS_PATH = os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+PLOTLY_JS_VERSION = get_plotlyjs_version()
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+@app.route('/assets/plotly.min.js')
+def plotly_js():
+    # Pregledači koji prihvataju gzip dobijaju unapred kompresovanu verziju (~3.5MB -> ~1MB)
+    if 'gzip' in request.accept_encodings:
+        response = send_file(get_plotly_js_gzip(), mimetype='application/javascript', max_age=IMMUTABLE_MAX_AGE,
+                             conditional=True, etag=f"plotly-{PLOTLY_JS_VERSION}-gzip")
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = send_file(PLOTLY_JS_PATH, mimetype='application/javascript', max_age=IMMUTABLE_MAX_AGE,
+                             conditional=True, etag=f"plotly-{PLOTLY_JS_VERSION}")
+    response.vary.add('Accept-Encoding')
+    return response
+
+plotly_js_gzip_lock = threading.Lock()
+
+def get_plotly_js_gzip():
+    """
+    Putanja do gzip verzije plotly.js; pravi se jednom po verziji plotly-ja (pored artefakata modela).
+    """
+    path = os.path.join(ARTIFACTS_DIR, f"plotly-{PLOTLY_JS_VERSION}.min.js.gz")
+    with plotly_js_gzip_lock:
+        if not os.path.isfile(path):
+            os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+            with open(PLOTLY_JS_PATH, 'rb') as f:
+                compressed = gzip.compress(f.read(), compresslevel=9)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+    return path
+
+@app.context_processor
+def inject_plotly_js_url():
+    return {'plotly_js_url': url_for('plotly_js', v=PLOTLY_JS_VERSION)}
+
+# Keš skupa podataka - novi redovi iz /add se čitaju inkrementalno, bez ponovnog parsiranja celog CSV-a
+dataset_cache = DatasetCache(DATA_PATH)
+
+# Kompresija tekstualnih odgovora (HTML, JSON, CSV). Mali odgovori i strimovani odgovori se ne kompresuju.
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/csv', 'text/plain', 'application/json', 'application/javascript'}
+COMPRESSION_MIN_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+@app.after_request
+def compress_response(response):
+    if (response.mimetype not in COMPRESSIBLE_MIMETYPES or response.status_code < 200 or response.status_code >= 300
+            or response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    encoding = request.accept_encodings.best_match(encodings)
+    data = response.get_data()
+    if encoding is None or len(data) < COMPRESSION_MIN_SIZE:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag is not None:
+        # Kompresovana verzija ima svoj ETag, da keševi ne pomešaju kodiranja
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
+
+# Uslovni GET: dashboard se menja samo kada se promeni verzija modela ili poslednje mjerenje.
+# U ETag ulaze i šablon i skripta dashboard-a, da izmenjena stranica ne ostane skrivena iza starog ETag-a.
+DASHBOARD_FILES = [os.path.join(app.root_path, 'templates', 'index.html'),
+                   os.path.join(app.root_path, 'static', 'js', 'dashboard.js')]
+
+def dashboard_etag(model_set, latest_row):
+    digest = hashlib.sha1(model_set.version.encode('utf-8'))
+    digest.update(latest_row.to_csv(index=False, header=False).encode('utf-8'))
+    for path in DASHBOARD_FILES:
+        digest.update(str(os.path.getmtime(path)).encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+def not_modified(etag):
+    """
+    Odgovor 304 ako klijent već ima verziju sa ovim ETag-om (inače None).
+    """
+    if etag is None or request.method not in ('GET', 'HEAD'):
+        return None
+    # Kompresovani odgovori imaju sufiks kodiranja na ETag-u
+    candidates = [etag] + [f"{etag}-{encoding}" for encoding in ('gzip', 'br')]
+    matched = [candidate for candidate in candidates if request.if_none_match.contains_weak(candidate)]
+    if not matched:
+        return None
+    response = Response(status=304)
+    response.set_etag(matched[0], weak=True)
+    response.cache_control.no_cache = True
+    response.vary.add('Accept-Encoding')
+    return response
+
+def with_etag(response, etag):
+    # Pregledač čuva odgovor, ali ga pre upotrebe proverava uslovnim zahtevom
+    response = make_response(response)
+    if etag is not None and request.method in ('GET', 'HEAD'):
+        response.set_etag(etag, weak=True)
+        response.cache_control.no_cache = True
+    return response
+
+# Nazivi predikcija po lokacijama u rezultatima i API odgovorima
+PREDICTION_COLUMNS = ['location_1', 'location_2', 'location_3']
+
 # Generisanje grafa za predikciju proizvodnje
 def generate_chart(predictions, selected_total, label):
     """
@@ -70,7 +238,7 @@ def generate_chart(predictions, selected_total, label):
         )
     )
 
-    return fig.to_html(full_html=False)
+    return fig.to_html(full_html=False, include_plotlyjs=False)  # plotly.js se učitava jednom, sa /assets/plotly.min.js
 
 
 # Generisanje grafa za uticaj parametara na proizvodnju
@@ -127,7 +295,70 @@ def generate_feature_importance_chart(importances, feature_names, title):
         xaxis=dict(tickangle=45)  # Rotacija oznaka na X-osi za bolju čitljivost
     )
 
-    return fig.to_html(full_html=False)
+    return fig.to_html(full_html=False, include_plotlyjs=False)  # plotly.js se učitava jednom, sa /assets/plotly.min.js
+
+
+# Keš grafova važnosti parametara po verziji modela: u memoriji i na disku (u direktorijumu verzije)
+IMPORTANCE_CHARTS_FILENAME = 'importance_charts.json'
+importance_charts_cache = {}  # verzija modela -> lista HTML fragmenata (3 lokacije + ukupna proizvodnja)
+importance_charts_lock = threading.Lock()
+
+def build_feature_importance_htmls(current_models):
+    """
+    Generiše grafove važnosti parametara za svaku lokaciju i za ukupnu proizvodnju.
+    """
+    importances = current_models.feature_importances()
+    feature_importance_htmls = [
+        generate_feature_importance_chart(
+            location_importances, FEATURE_COLUMNS, f"Uticaj parametara - Lokacija {i+1}"
+        ) for i, location_importances in enumerate(importances)
+    ]
+
+    # Graf za prosečan uticaj parametara (ukupna proizvodnja)
+    avg_feature_importances = sum(importances) / len(importances)
+    feature_importance_htmls.append(generate_feature_importance_chart(
+        avg_feature_importances, FEATURE_COLUMNS, "Uticaj parametara - Ukupna proizvodnja"
+    ))
+    return feature_importance_htmls
+
+def get_feature_importance_htmls(current_models):
+    """
+    Vraća grafove važnosti za verziju modela; računaju se jednom po verziji (pa se čuvaju i na disku).
+    """
+    version = current_models.version
+    feature_importance_htmls = importance_charts_cache.get(version)
+    if feature_importance_htmls is not None:
+        return feature_importance_htmls
+
+    with importance_charts_lock:
+        if version not in importance_charts_cache:
+            path = artifact_path(ARTIFACTS_DIR, version, IMPORTANCE_CHARTS_FILENAME)
+            try:
+                with open(path) as f:
+                    feature_importance_htmls = json.load(f)
+            except (FileNotFoundError, ValueError):
+                feature_importance_htmls = build_feature_importance_htmls(current_models)
+                save_artifact_json(path, feature_importance_htmls)
+            # Čuvaju se samo grafovi aktivne verzije (i eventualno prethodne, dok se zahtevi ne završe)
+            for old_version in list(importance_charts_cache)[:-1]:
+                del importance_charts_cache[old_version]
+            importance_charts_cache[version] = feature_importance_htmls
+        return importance_charts_cache[version]
+
+# Grafovi važnosti se pripremaju čim se verzija modela aktivira, pre prvog zahteva
+model_registry.on_activate.append(get_feature_importance_htmls)
+get_feature_importance_htmls(model_registry.current)
+
+# Keš predikcija i grafa po (verzija modela, ulazni red): ponovljeni zahtevi bez novih podataka ne pozivaju modele
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_SECONDS)
+model_registry.on_activate.append(lambda model_set: prediction_cache.clear())  # Stari ključevi više ne mogu da se pogode
+
+def cached_prediction(current_models, features):
+    """
+    Vraća (ključ, stavka keša) za jedan ulazni red; stavka sadrži 'predictions' i, kada je iscrtan, 'chart_html'.
+    """
+    key = feature_key(current_models.version, features)
+    return key, prediction_cache.get_or_compute(key, lambda: {'predictions': current_models.predict(features)[0].tolist()})
 
 
 # Glavna ruta za predikcije. Obrada intervala (sat)
@@ -138,20 +369,28 @@ def predict(interval="hourly"):
     chart_html = ""
     feature_importance_htmls = []
     interval_class = interval  # Klasa za stilizaciju aktivnog dugmeta
+    etag = None
 
-    if request.method == 'POST':
-        # Svaki put učitavamo podatke jer korisnik može dodati novi red (mjerenje)
-        X, _ = load_and_preprocess_data('dataset/Data_Cacak.csv')
-
+    # GET na /predict/hourly takođe prikazuje predikciju (stranicu periodično osvežavaju monitori),
+    # a '/' bez POST-a prikazuje samo formu
+    if request.method == 'POST' or request.url_rule.rule != '/':
         try:
-            
-            # Priprema ulaznih podataka za modele
-            input_data = pd.DataFrame([X.iloc[-1].tolist()], columns=X.columns) #Napraviti jedan novi red podataka (kao DataFrame) koji se može dati modelu za predikciju
-            models = [model_location_1, model_location_2, model_location_3]
-
-            # Izračunavanje predikcija
-            predictions = [model.predict(input_data)[0] for model in models]
-            
+            # Poslednje mjerenje iz keša (keš sam učitava redove koje je korisnik u međuvremenu dodao)
+            input_data = dataset_cache.latest_row()
+            current_models = get_model_set()  # Isti skup modela za ceo zahtev, i ako se u međuvremenu zameni
+
+            # Stranica se ne menja dok su verzija modela i poslednje mjerenje isti
+            etag = dashboard_etag(current_models, input_data)
+            unchanged = not_modified(etag)
+            if unchanged is not None:
+                return unchanged
+
+            features = features_to_matrix(input_data)  # float32 matrica, isti oblik kao pri treniranju
+
+            # Izračunavanje predikcija (jedan poziv za sve lokacije, ili iz keša za isti red i istu verziju)
+            cache_key, cached = cached_prediction(current_models, features)
+            predictions = cached['predictions']
+
             # Obrada na osnovu izabranog intervala (samo satni interval)
             selected_predictions = predictions
             selected_total = sum(predictions)
@@ -165,38 +404,31 @@ def predict(interval="hourly"):
                 'total_production': selected_total
             }
 
-            # Generisanje glavnog grafa predikcija
-            chart_html = generate_chart(selected_predictions, selected_total, label)
-
-            # Generisanje grafova važnosti parametara
-            feature_importance_htmls = [
-                generate_feature_importance_chart(
-                    model.named_steps['regressor'].feature_importances_, input_data.columns, f"Uticaj parametara - Lokacija {i+1}"
-                ) for i, model in enumerate(models)
-            ]
-
-            # Graf za prosečan uticaj parametara (ukupna proizvodnja)
-            avg_feature_importances = sum(
-                model.named_steps['regressor'].feature_importances_ for model in models
-            ) / len(models)
-            total_feature_importance_chart = generate_feature_importance_chart(
-                avg_feature_importances, input_data.columns, "Uticaj parametara - Ukupna proizvodnja"
-            )
-            feature_importance_htmls.append(total_feature_importance_chart)
+            # Generisanje glavnog grafa predikcija (jednom po stavci keša)
+            chart_html = cached.get('chart_html')
+            if chart_html is None:
+                chart_html = generate_chart(selected_predictions, selected_total, label)
+                prediction_cache.put(cache_key, dict(cached, chart_html=chart_html))
+
+            # Grafovi važnosti parametara se ne menjaju za istu verziju modela - uzimaju se iz keša
+            feature_importance_htmls = get_feature_importance_htmls(current_models)
 
         except Exception as e:
             # Ako dođe do greške, proslediti poruku
             result = f"Greška: {e}"
 
     # Renderovanje šablona sa rezultatima i grafovima
-    return render_template(
+    return with_etag(render_template(
         "index.html",
         result=result,
         chart_html=chart_html,
         feature_importance_htmls=feature_importance_htmls,
         interval_class=interval_class
-    )
+    ), etag if isinstance(result, dict) else None)
+
 
+# Polja forme za dodavanje mjerenja, redom kao DATASET_COLUMNS
+ADD_FORM_FIELDS = ['datetime', 'air_temp', 'cloud_opacity', 'dhi', 'dni', 'ebh', 'ghi', 'prod_loc1', 'prod_loc2', 'prod_loc3']
 
 # Dugme za dodavanje novog mjerenja
 @app.route('/add', methods=['GET', 'POST'])
@@ -206,32 +438,18 @@ def add_data():
 
     if request.method == 'POST':
         try:
-            # Učitavanje unosa iz forme
-            datetime = request.form['datetime']
-            air_temp = float(request.form['air_temp'])
-            cloud_opacity = float(request.form['cloud_opacity'])
-            dhi = float(request.form['dhi'])
-            dni = float(request.form['dni'])
-            ebh = float(request.form['ebh'])
-            ghi = float(request.form['ghi'])
-            prod_loc1 = float(request.form['prod_loc1'])
-            prod_loc2 = float(request.form['prod_loc2'])
-            prod_loc3 = float(request.form['prod_loc3'])
-
-            # Validacija unosa
-            if not datetime.strip():
-                raise ValueError("Datum i vreme ne mogu biti prazni.")
-
-            if air_temp < -50 or air_temp > 50:
-                raise ValueError("Temperatura mora biti između -50 i 50 stepeni.")
-            if cloud_opacity < 0 or cloud_opacity > 100:
-                raise ValueError("Oblačnost mora biti između 0% i 100%.")
-            if dhi <= 0 or dni <= 0 or ebh <= 0 or ghi <= 0 or prod_loc1 <= 0 or prod_loc2 <= 0 or prod_loc3 <= 0:
-                raise ValueError("Sve vrednosti moraju biti pozitivni brojevi ili nula.")
-
-            # Dodavanje validiranih podataka u CSV
-            with open('dataset/Data_Cacak.csv', 'a') as f:
-                f.write(f"{datetime},{air_temp},{cloud_opacity},{dhi},{dni},{ebh},{ghi},{prod_loc1},{prod_loc2},{prod_loc3}\n")
+            # Učitavanje unosa iz forme (polja redom kao kolone skupa podataka)
+            values = [request.form[field].strip() for field in ADD_FORM_FIELDS]
+            on_duplicate = ON_DUPLICATE_UPSERT if request.form.get('replace_existing') else ON_DUPLICATE_REJECT
+
+            # Validacija (ista pravila i provera duplikata kao za grupni unos) i zaključan upis u CSV
+            report = ingest_batches(DATA_PATH, [pd.DataFrame([values], columns=DATASET_COLUMNS)], on_duplicate=on_duplicate)
+            if report['rejected']:
+                raise ValueError(" ".join(error_messages(report['rejected_rows'])))
+
+            # Inkrementalno ažuriranje keša (čita se samo novi red)
+            dataset_cache.refresh()
+            retraining_scheduler.notify_new_rows()
 
             return redirect(url_for('predict'))
 
@@ -242,5 +460,230 @@ def add_data():
     return render_template('add_data.html', success_message=success_message, error_message=error_message)
 
 
+# Grupni unos mjerenja: CSV (telo zahteva ili fajl 'file'), NDJSON ili JSON lista redova.
+# CSV i NDJSON se čitaju u delovima; validni redovi se dopisuju jednim upisom, a nevalidni se prijavljuju.
+# ?on_duplicate=upsert upisuje i mjerenja za postojeća vremena (kao ispravke), umesto da ih odbije.
+@app.route('/api/measurements', methods=['POST'])
+def ingest_measurements():
+    if 'file' in request.files:
+        batches = iter_csv_batches(request.files['file'].stream, INGEST_CHUNK_ROWS)
+    elif request.mimetype == 'text/csv':
+        batches = iter_csv_batches(request.stream, INGEST_CHUNK_ROWS)
+    elif request.mimetype == 'application/x-ndjson':
+        batches = iter_ndjson_batches(request.stream, INGEST_CHUNK_ROWS)
+    elif request.is_json:
+        payload = request.get_json(silent=True)
+        rows = payload.get('rows') if isinstance(payload, dict) else payload
+        if not isinstance(rows, list):
+            return jsonify({'error': "Greška: očekuje se JSON lista redova ili objekat sa listom 'rows'."}), 400
+        batches = iter_json_batches(rows, INGEST_CHUNK_ROWS)
+    else:
+        return jsonify({'error': "Greška: podržani formati su text/csv, application/x-ndjson i application/json."}), 415
+
+    try:
+        on_duplicate = request.args.get('on_duplicate', INGEST_ON_DUPLICATE)
+        report = ingest_batches(DATA_PATH, batches, INGEST_MAX_REPORTED_ROWS, on_duplicate)
+    except ValueError as e:
+        return jsonify({'error': f"Greška: {e}"}), 400
+
+    if report['appended']:
+        dataset_cache.refresh()
+        retraining_scheduler.notify_new_rows(report['appended'])
+    return jsonify(report), 200 if report['appended'] or not report['received'] else 400
+
+
+# Informacije o aktivnoj verziji modela
+@app.route('/api/models', methods=['GET'])
+def model_info():
+    current_models = get_model_set()
+    return jsonify({
+        'version': current_models.version,
+        'kind': current_models.kind,
+        'created_at': current_models.metadata.get('created_at'),
+        'metrics': current_models.metadata.get('metrics'),
+    })
+
+
+# Učitavanje nove verzije modela u pozadini (bez prekida rada aplikacije).
+# Bez verzije se učitava LATEST, a zadata verzija se postavlja kao LATEST (npr. povratak na prethodnu).
+@app.route('/api/models/reload', methods=['POST'])
+def reload_models():
+    payload = request.get_json(silent=True) or {}
+    version = payload.get('version')
+    try:
+        if version is None:
+            model_registry.load_async()
+        else:
+            model_registry.promote(version)
+    except ValueError as e:
+        return jsonify({'error': f"Greška: {e}"}), 400
+    except FileNotFoundError:
+        return jsonify({'error': f"Verzija modela '{version}' ne postoji."}), 404
+    return jsonify({'active_version': model_registry.version, 'requested_version': version or 'LATEST'}), 202
+
+
+# Predikcija za poslednje mjerenje kao sirovi brojevi (graf se iscrtava u pregledaču)
+@app.route('/api/predictions/latest', methods=['GET'])
+def latest_prediction():
+    try:
+        latest_row = dataset_cache.latest_row()
+    except ValueError as e:
+        return jsonify({'error': f"Greška: {e}"}), 404
+
+    current_models = get_model_set()
+    etag = dashboard_etag(current_models, latest_row)
+    unchanged = not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+
+    predictions = cached_prediction(current_models, features_to_matrix(latest_row))[1]['predictions']
+    return with_etag(jsonify({
+        'model_version': current_models.version,
+        'datetime': latest_row[DATETIME_COLUMN].iloc[0].strftime('%Y-%m-%dT%H:%M'),
+        'predictions': dict(zip(PREDICTION_COLUMNS, predictions), total_production=sum(predictions)),
+    }), etag)
+
+
+# Važnost parametara za aktivnu verziju modela. Sa ?version=<aktivna verzija> odgovor je nepromenljiv
+# i pregledač ga kešira, pa se dohvata jednom po verziji modela.
+@app.route('/api/importances', methods=['GET'])
+def feature_importances():
+    current_models = get_model_set()
+    unchanged = not_modified(current_models.version)
+    if unchanged is not None:
+        return unchanged
+
+    importances = current_models.feature_importances()
+    response = jsonify({
+        'model_version': current_models.version,
+        'features': FEATURE_COLUMNS,
+        'locations': [location_importances.tolist() for location_importances in importances],
+        'average': (sum(importances) / len(importances)).tolist(),
+    })
+    response.set_etag(current_models.version, weak=True)
+    if request.args.get('version') == current_models.version:
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
+# Broj redova po delu odgovora pri strimovanju grupnih predikcija
+STREAM_CHUNK_ROWS = 1000
+
+def read_batch_request():
+    """
+    Ulazni podaci za grupnu predikciju:
+    - opseg datuma (start i end u upitu ili JSON telu) -> mjerenja iz skupa podataka u tom opsegu
+    - JSON lista 'rows' ili otpremljen CSV fajl 'file' sa vremenskim podacima (kolone ulaznih parametara)
+    """
+    payload = request.get_json(silent=True) or {}
+    if 'file' in request.files:
+        data = pd.read_csv(request.files['file'])
+    elif 'rows' in payload:
+        data = pd.DataFrame(payload['rows'])
+    else:
+        start = payload.get('start', request.args.get('start'))
+        end = payload.get('end', request.args.get('end'))
+        if not start or not end:
+            raise ValueError("Zadajte opseg datuma (start, end), listu 'rows' ili CSV fajl 'file'.")
+        # Opseg se čita preko indeksa po vremenu (bez duplikata, poređano po vremenu)
+        data = read_time_range(DATA_PATH, pd.Timestamp(start), pd.Timestamp(end))
+        return data.dropna(subset=FEATURE_COLUMNS).reset_index(drop=True)
+
+    data, invalid = prepare_feature_rows(data)
+    if invalid.any():
+        raise ValueError(f"Nevalidni ulazni parametri u redovima: {np.flatnonzero(invalid)[:20].tolist()}")
+    return data
+
+def stream_predictions(data, predictions, model_version, output_format):
+    """
+    Strimuje predikcije u delovima (JSON ili CSV), bez pravljenja celog odgovora u memoriji.
+    """
+    result = pd.DataFrame(predictions, columns=PREDICTION_COLUMNS)
+    result['total_production'] = predictions.sum(axis=1)
+    if DATETIME_COLUMN in data.columns:
+        result.insert(0, 'datetime', data[DATETIME_COLUMN].dt.strftime('%Y-%m-%dT%H:%M').to_numpy())
+
+    def generate_csv():
+        yield result.iloc[:0].to_csv(index=False)  # Zaglavlje
+        for start in range(0, len(result), STREAM_CHUNK_ROWS):
+            yield result.iloc[start:start + STREAM_CHUNK_ROWS].to_csv(index=False, header=False)
+
+    def generate_json():
+        yield f'{{"model_version": "{model_version}", "count": {len(result)}, "predictions": ['
+        for start in range(0, len(result), STREAM_CHUNK_ROWS):
+            records = result.iloc[start:start + STREAM_CHUNK_ROWS].to_json(orient='records')[1:-1]
+            yield (',' if start else '') + records
+        yield ']}'
+
+    if output_format == 'csv':
+        return Response(generate_csv(), mimetype='text/csv')
+    return Response(generate_json(), mimetype='application/json')
+
+
+# Grupna predikcija za opseg datuma ili poslatu seriju vremenskih podataka (jedan predict poziv po modelu)
+@app.route('/api/predict', methods=['GET', 'POST'])
+def predict_batch():
+    payload = request.get_json(silent=True) or {}
+    output_format = request.args.get('format', payload.get('format', 'json'))
+    try:
+        data = read_batch_request()
+    except ValueError as e:
+        return jsonify({'error': f"Greška: {e}"}), 400
+
+    current_models = get_model_set()
+    predictions = current_models.predict(features_to_matrix(data)) if len(data) else np.empty((0, len(PREDICTION_COLUMNS)))
+    return stream_predictions(data, predictions, current_models.version, output_format)
+
+
+def production_records(production, datetime_format):
+    """
+    Redovi proizvodnje (satne, dnevne ili mjesečne) iz forecast() za JSON odgovor.
+    """
+    result = production.rename(columns=dict(zip(TARGET_COLUMNS + ['Total Production'], PREDICTION_COLUMNS + ['total_production'])))
+    result.insert(0, 'datetime', production.index.strftime(datetime_format))
+    return result.to_dict(orient='records')
+
+def read_forecast_request():
+    """
+    Vremenski podaci za prognozu: JSON lista 'rows' ili CSV fajl 'file' sa budućim vremenskim podacima
+    (svaki red sa Datetime), ili procena iz istorije za narednih 'hours' sati. Vraća (podaci, izvor).
+    """
+    payload = request.get_json(silent=True) or {}
+    if 'file' in request.files or 'rows' in payload:
+        weather = read_batch_request()
+        if weather.empty:
+            raise ValueError("Nema redova za prognozu.")
+        if DATETIME_COLUMN not in weather.columns or weather[DATETIME_COLUMN].isna().any():
+            raise ValueError("Za prognozu svaki red mora imati ispravan Datetime.")
+        return weather, 'weather'
+
+    hours = str(payload.get('hours', request.args.get('hours', FORECAST_DEFAULT_HOURS)))
+    if not hours.isdigit() or not 1 <= int(hours) <= FORECAST_MAX_HOURS:
+        raise ValueError(f"Broj sati mora biti između 1 i {FORECAST_MAX_HOURS}.")
+    return weather_from_history(DATA_PATH, int(hours)), 'history'
+
+# Prognoza za naredne sate za sve lokacije (jedan predict poziv), sa dnevnim i mjesečnim zbirom iz satnih predikcija
+@app.route('/api/forecast', methods=['GET', 'POST'])
+def forecast_production():
+    try:
+        weather, source = read_forecast_request()
+    except ValueError as e:
+        return jsonify({'error': f"Greška: {e}"}), 400
+
+    current_models = get_model_set()
+    hourly, daily, monthly = forecast(current_models, weather)
+    return jsonify({
+        'model_version': current_models.version,
+        'source': source,
+        'hourly': production_records(hourly, '%Y-%m-%dT%H:%M'),
+        'daily': production_records(daily, '%Y-%m-%d'),
+        'monthly': production_records(monthly, '%Y-%m'),
+    })
+
+
 if __name__ == "__main__":
     app.run(debug=True)
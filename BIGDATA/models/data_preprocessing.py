@@ -1,22 +1,55 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
 import pandas as pd
+from sklearn.model_selection import train_test_split
+from models.file_lock import file_lock
+from models.datetime_index import DatetimeIndex
+
+# Ulazni parametri modela i ciljne kolone (proizvodnja po lokacijama)
+DATETIME_COLUMN = 'Datetime'
+FEATURE_COLUMNS = ['AirTemperature', 'CloudOpacity', 'DHI', 'DNI', 'EBH', 'GHI']
+TARGET_COLUMNS = ['Production - Location 1', 'Production - Location 2', 'Production - Location 3']
+# Kolone CSV fajla skupa podataka, redom
+DATASET_COLUMNS = [DATETIME_COLUMN] + FEATURE_COLUMNS + TARGET_COLUMNS
+
+# Tipovi kolona: ulazni parametri float32, ciljevi float64, datum i vreme datetime64
+FEATURE_DTYPE = np.float32
+TARGET_DTYPE = np.float64
+DATETIME_DTYPE = 'datetime64[s]'
+
+# Formati datuma koji se pojavljuju u skupu podataka (forma /add šalje ISO format)
+DATETIME_FORMATS = ['%m/%d/%Y %H:%M', '%m-%d-%y %H:%M', '%Y-%m-%dT%H:%M']
 
 """
   Učitava i priprema podatke za treniranje modela.
 - Uklanja nedostajuće vrednosti.
 - Razdvaja ulazne (X) i izlazne (y) podatke.
+- Indeks X i y je kolona Datetime (datetime64 iz binarnog odraza), pa se podaci mogu seći po vremenu.
 """
 def load_and_preprocess_data(filepath):
-    # Učitavanje podataka iz CSV fajla
-    data = pd.read_csv(filepath)
+    # Učitavanje podataka iz binarnog odraza CSV fajla (odraz se prethodno usklađuje sa CSV-om)
+    data = load_dataset(filepath)
     print("Originalne dimenzije skupa podataka:", data.shape)  # Prikaz originalnih dimenzija
 
-    # Priprema podataka (konverzija u numeričke vrednosti i uklanjanje nedostajućih podataka)
-    data = prepare_input_data(data)
+    # Ponovljeno vreme je ispravka ranijeg mjerenja - zadržava se poslednji upisani red
+    data = data.drop_duplicates(DATETIME_COLUMN, keep='last')
+
+    # Uklanjanje nedostajućih podataka (kolone su već konvertovane pri izgradnji odraza)
+    data = data.dropna()
 
     print("Dimenzije posle uklanjanja nedostajućih vrednosti:", data.shape)  # Prikaz dimenzija nakon čišćenja
 
+    # Vreme mjerenja kao indeks (već parsirano u odrazu, bez ponovnog parsiranja teksta)
+    data = data.set_index(DATETIME_COLUMN)
+
     # Razdvajanje ulaznih podataka (X) i ciljeva (y)
-    X = data[['AirTemperature', 'CloudOpacity', 'DHI', 'DNI', 'EBH', 'GHI']]  # Ulazni parametri
+    X = data[FEATURE_COLUMNS]  # Ulazni parametri
     y = {
         'Production - Location 1': data['Production - Location 1'],  # Ciljna promenljiva za Lokaciju 1
         'Production - Location 2': data['Production - Location 2'],  # Ciljna promenljiva za Lokaciju 2
@@ -24,14 +57,397 @@ def load_and_preprocess_data(filepath):
     }
     return X, y  # Vraća ulazne podatke i ciljeve
 
+def _datetime_formats_for(values):
+    # Format prvog nepraznog datuma se proba prvi (podaci iz jednog izvora obično imaju jedan format),
+    # pa se za takve podatke kolona parsira jednim prolazom
+    present = values[values.ne('') & values.ne('nan')]
+    if present.empty:
+        return DATETIME_FORMATS
+    for datetime_format in DATETIME_FORMATS:
+        try:
+            datetime.strptime(present.iloc[0], datetime_format)
+        except ValueError:
+            continue
+        return [datetime_format] + [other for other in DATETIME_FORMATS if other != datetime_format]
+    return DATETIME_FORMATS
+
+def parse_datetime_column(values):
+    """
+    Parsira kolonu Datetime u datetime64 sa eksplicitnim formatima (brzo, bez pogađanja formata za svaki red).
+    Samo vrednosti koje ne odgovaraju nijednom poznatom formatu parsiraju se sporijim putem.
+    """
+    values = pd.Series(values, dtype=object).astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for datetime_format in _datetime_formats_for(values):
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=datetime_format, errors='coerce')
+
+    missing = parsed.isna() & values.ne('') & values.ne('nan')
+    if missing.any():
+        parsed[missing] = pd.to_datetime(values[missing], format='mixed', errors='coerce')
+    return parsed.astype(DATETIME_DTYPE)
+
+def convert_column_types(data):
+    """
+    Pretvara kolone u odgovarajuće tipove; nevalidne vrednosti postaju NaN/NaT.
+    """
+    data[DATETIME_COLUMN] = parse_datetime_column(data[DATETIME_COLUMN])
+    for column in FEATURE_COLUMNS:
+        data[column] = pd.to_numeric(data[column], errors='coerce').astype(FEATURE_DTYPE)  # Pretvara podatke u float, uklanja nevalidne vrednosti
+    for column in TARGET_COLUMNS:
+        data[column] = pd.to_numeric(data[column], errors='coerce').astype(TARGET_DTYPE)
+    return data
+
+def prepare_feature_rows(data):
+    """
+    Priprema redove sa ulaznim parametrima (npr. serija vremenskih podataka za predikciju):
+    konvertuje FEATURE_COLUMNS u float32 i Datetime (ako postoji) u datetime64.
+    Vraća (podaci, maska nevalidnih redova). Baca ValueError ako neka kolona nedostaje.
+    """
+    missing_columns = [column for column in FEATURE_COLUMNS if column not in data.columns]
+    if missing_columns:
+        raise ValueError(f"Nedostaju kolone: {', '.join(missing_columns)}")
+
+    data = data.copy()
+    if DATETIME_COLUMN in data.columns:
+        data[DATETIME_COLUMN] = parse_datetime_column(data[DATETIME_COLUMN])
+    for column in FEATURE_COLUMNS:
+        data[column] = pd.to_numeric(data[column], errors='coerce').astype(FEATURE_DTYPE)
+    invalid = data[FEATURE_COLUMNS].isna().any(axis=1).to_numpy()
+    return data, invalid
+
 def prepare_input_data(data):
     """
     Pretvara kolone u numeričke vrednosti i uklanja redove sa nedostajućim podacima.
     """
     # Konverzija podataka u numeričke vrednosti
-    for column in ['AirTemperature', 'CloudOpacity', 'DHI', 'DNI', 'EBH', 'GHI']:
-        data[column] = pd.to_numeric(data[column], errors='coerce')  # Pretvara podatke u float, uklanja nevalidne vrednosti
+    data = convert_column_types(data)
     
     # Uklanjanje redova sa nedostajućim vrednostima
     data = data.dropna()
     return data  # Vraća očišćene podatke
+
+
+# ---------------------------------------------------------------------------
+# Kolonski binarni odraz CSV fajla
+# - Za svaku kolonu jedan .npy fajl (float32 ulazi, float64 ciljevi, datetime64 vreme).
+# - meta.json pamti do kog bajta je CSV preslikan i otisak poslednjih bajtova,
+#   pa se dodati redovi samo dopisuju, a izmena postojećeg sadržaja izaziva ponovnu izgradnju.
+# - CSV ostaje izvor istine koji se ručno uređuje; odraz se uvek može obrisati i ponovo izgraditi.
+# ---------------------------------------------------------------------------
+MIRROR_META_FILENAME = 'meta.json'
+MIRROR_FINGERPRINT_SIZE = 256
+
+_mirror_lock = threading.Lock()
+
+def mirror_dir_for(filepath):
+    return os.path.splitext(filepath)[0] + '.mirror'
+
+@contextmanager
+def _locked_mirror(mirror_dir):
+    # Odraz menja najviše jedna nit i jedan proces u isto vreme (više radnih procesa, treniranje)
+    with _mirror_lock, file_lock(mirror_dir):
+        yield
+
+def _mirror_column_path(mirror_dir, column):
+    return os.path.join(mirror_dir, column.replace(' ', '_') + '.npy')
+
+def _mirror_dtype(column):
+    if column == DATETIME_COLUMN:
+        return np.dtype(DATETIME_DTYPE)
+    return np.dtype(FEATURE_DTYPE if column in FEATURE_COLUMNS else TARGET_DTYPE)
+
+def _file_fingerprint(f, offset):
+    start = max(0, offset - MIRROR_FINGERPRINT_SIZE)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+def _read_mirror_meta(mirror_dir):
+    try:
+        with open(os.path.join(mirror_dir, MIRROR_META_FILENAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_mirror_meta_file(path, meta):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def _write_mirror_meta(mirror_dir, meta):
+    _write_mirror_meta_file(os.path.join(mirror_dir, MIRROR_META_FILENAME), meta)
+
+def _parse_csv_bytes(raw, columns=None):
+    # Parsira kompletne redove CSV-a (sa zaglavljem ako columns nije zadat) i konvertuje tipove
+    if columns is None:
+        data = pd.read_csv(io.BytesIO(raw))
+    else:
+        data = pd.read_csv(io.BytesIO(raw), header=None, names=columns)
+    return convert_column_types(data)
+
+def _save_npy(path, array):
+    np.save(path + '.tmp.npy', array)
+    os.replace(path + '.tmp.npy', path)
+
+def _append_npy(path, array):
+    """
+    Dopisuje redove na kraj postojećeg .npy fajla i menja samo broj redova u zaglavlju.
+    (numpy ostavlja rezervni prostor u zaglavlju upravo za rast po prvoj osi.)
+    """
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        data_offset = f.tell()
+
+        header = io.BytesIO()
+        write_header = np.lib.format.write_array_header_1_0 if version == (1, 0) else np.lib.format.write_array_header_2_0
+        write_header(header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': fortran_order, 'shape': (shape[0] + len(array),)})
+        if header.tell() != data_offset:
+            # Zaglavlje ne može da se izmeni u mestu - fajl se prepisuje
+            existing = np.load(path)
+            f.close()
+            _save_npy(path, np.concatenate([existing, array.astype(dtype)]))
+            return
+
+        f.seek(data_offset + shape[0] * dtype.itemsize)
+        f.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        f.truncate()
+        f.seek(0)
+        f.write(header.getvalue())
+
+def _rebuild_mirror(f, mirror_dir):
+    f.seek(0)
+    raw = f.read()
+    raw = raw[:raw.rfind(b'\n') + 1]
+    data = _parse_csv_bytes(raw)
+    os.makedirs(mirror_dir, exist_ok=True)
+    for column in data.columns:
+        _save_npy(_mirror_column_path(mirror_dir, column), data[column].to_numpy(dtype=_mirror_dtype(column)))
+    return {'columns': list(data.columns), 'rows': len(data), 'offset': len(raw)}
+
+def _append_to_mirror(f, mirror_dir, meta):
+    f.seek(meta['offset'])
+    raw = f.read()
+    raw = raw[:raw.rfind(b'\n') + 1]
+    if raw.strip():
+        data = _parse_csv_bytes(raw, meta['columns'])
+        for column in meta['columns']:
+            _append_npy(_mirror_column_path(mirror_dir, column), data[column].to_numpy(dtype=_mirror_dtype(column)))
+        meta['rows'] += len(data)
+    meta['offset'] += len(raw)
+    return meta
+
+def sync_mirror(filepath):
+    """
+    Usklađuje binarni odraz sa CSV fajlom i vraća njegove metapodatke.
+    - Odraz ne postoji ili je CSV izmenjen (skraćen/prepravljen) -> ponovna izgradnja.
+    - CSV je samo dopunjen -> parsiraju se i dopisuju samo novi kompletni redovi.
+    """
+    mirror_dir = mirror_dir_for(filepath)
+    with _locked_mirror(mirror_dir), open(filepath, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        meta = _read_mirror_meta(mirror_dir)
+        if meta is None or meta['offset'] > size or _file_fingerprint(f, meta['offset']) != meta['fingerprint']:
+            meta = _rebuild_mirror(f, mirror_dir)
+        elif size > meta['offset']:
+            meta = _append_to_mirror(f, mirror_dir, meta)
+        else:
+            return meta
+        meta['fingerprint'] = _file_fingerprint(f, meta['offset'])
+        _write_mirror_meta(mirror_dir, meta)
+        return meta
+
+# Indeks po koloni Datetime (sortirana vremena + brojevi redova), čuva se uz odraz i dopunjuje pri dopisivanju
+DATETIME_INDEX_TIMES_FILENAME = 'datetime_index_times.npy'
+DATETIME_INDEX_ROWS_FILENAME = 'datetime_index_rows.npy'
+DATETIME_INDEX_META_FILENAME = 'datetime_index_meta.json'
+
+def _build_datetime_index(datetimes, first_row=0):
+    # Vremena bez NaT, stabilno sortirana (isti trenuci ostaju redom upisa) i odgovarajući brojevi redova
+    rows = np.flatnonzero(~np.isnat(datetimes)) + first_row
+    times = datetimes[rows - first_row]
+    order = np.argsort(times, kind='stable')
+    return times[order], rows[order]
+
+def sync_datetime_index(filepath, meta=None):
+    """
+    Usklađuje indeks po vremenu sa binarnim odrazom i vraća ga (DatetimeIndex nad memorijski mapiranim nizovima).
+    - Redovi dopisani hronološkim redom se samo dodaju na kraj indeksa.
+    - Inače (ili kada je odraz ponovo izgrađen) indeks se gradi iz početka.
+    """
+    meta = sync_mirror(filepath) if meta is None else meta
+    mirror_dir = mirror_dir_for(filepath)
+    times_path = os.path.join(mirror_dir, DATETIME_INDEX_TIMES_FILENAME)
+    rows_path = os.path.join(mirror_dir, DATETIME_INDEX_ROWS_FILENAME)
+    index_meta_path = os.path.join(mirror_dir, DATETIME_INDEX_META_FILENAME)
+    key = {'rows': meta['rows'], 'offset': meta['offset'], 'fingerprint': meta['fingerprint']}
+
+    with _locked_mirror(mirror_dir), open(filepath, 'rb') as f:
+        try:
+            with open(index_meta_path) as meta_file:
+                index_meta = json.load(meta_file)
+        except (FileNotFoundError, ValueError):
+            index_meta = None
+
+        if index_meta != key:
+            datetimes = np.load(_mirror_column_path(mirror_dir, DATETIME_COLUMN), mmap_mode='r')[:meta['rows']]
+            appended = (index_meta is not None and index_meta['rows'] <= meta['rows']
+                        and index_meta['offset'] <= meta['offset']
+                        and _file_fingerprint(f, index_meta['offset']) == index_meta['fingerprint'])
+            if appended:
+                times, rows = _build_datetime_index(np.asarray(datetimes[index_meta['rows']:]), index_meta['rows'])
+                indexed = np.load(times_path, mmap_mode='r')
+                in_order = len(times) == 0 or len(indexed) == 0 or times[0] >= indexed[-1]
+                if in_order and len(times):
+                    _append_npy(times_path, times)
+                    _append_npy(rows_path, rows)
+                appended = in_order
+            if not appended:
+                times, rows = _build_datetime_index(np.asarray(datetimes))
+                _save_npy(times_path, times)
+                _save_npy(rows_path, rows)
+            _write_mirror_meta_file(index_meta_path, key)
+
+    return DatetimeIndex(np.load(times_path, mmap_mode='r'), np.load(rows_path, mmap_mode='r'))
+
+def read_time_range(filepath, start=None, end=None, columns=None):
+    """
+    Mjerenja sa vremenom u opsegu [start, end], poređana po vremenu i bez duplikata (važi poslednji upis).
+    Čitaju se samo redovi iz opsega (pretraga po indeksu), ne ceo skup podataka.
+    """
+    meta = sync_mirror(filepath)
+    rows = sync_datetime_index(filepath, meta).range(start, end)
+    data = read_mirror_columns(filepath, meta, columns, mmap_mode='r')
+    return pd.DataFrame({column: values[rows] for column, values in data.items()})
+
+def read_latest_measurement(filepath, block_rows=256):
+    """
+    Validno mjerenje sa najvećim Datetime (za ponovljeno vreme važi poslednji upis) kao DataFrame sa jednim redom,
+    i metapodaci odraza iz kojih je pročitano. Ispravke starijih sati dopisane na kraj fajla ga ne menjaju.
+    Vraća (None, meta) ako validnog mjerenja nema.
+    """
+    meta = sync_mirror(filepath)
+    rows = sync_datetime_index(filepath, meta).range()
+    columns = read_mirror_columns(filepath, meta, mmap_mode='r')
+    # Od najnovijeg vremena unazad, u blokovima, do prvog reda bez nedostajućih vrednosti
+    for end in range(len(rows), 0, -block_rows):
+        block = rows[max(0, end - block_rows):end]
+        data = pd.DataFrame({column: values[block] for column, values in columns.items()}).dropna()
+        if not data.empty:
+            return data.iloc[[-1]].reset_index(drop=True), meta
+    return None, meta
+
+def load_time_series(filepath, start=None, end=None, columns=None):
+    """
+    Očišćena mjerenja u opsegu [start, end] kao DataFrame sa indeksom po vremenu (sortiran, bez duplikata),
+    spremna za sečenje po vremenu (data.loc['2023-05']) i resample.
+    """
+    columns = DATASET_COLUMNS if columns is None else [DATETIME_COLUMN] + [c for c in columns if c != DATETIME_COLUMN]
+    data = read_time_range(filepath, start, end, columns).dropna()
+    return data.set_index(DATETIME_COLUMN)
+
+def resample_production(data, rule):
+    """
+    Zbir proizvodnje po lokacijama i ukupno za periode zadate pravilom ('D' - dan, 'MS' - mjesec, ...).
+    data mora imati indeks po vremenu (load_time_series).
+    """
+    production = data[TARGET_COLUMNS].resample(rule).sum(min_count=1)
+    production['Total Production'] = production.sum(axis=1, min_count=1)
+    return production.dropna(how='all')
+
+def read_mirror_columns(filepath, meta, columns=None, mmap_mode=None):
+    """
+    Čita kolone iz binarnog odraza kao NumPy nizove (opciono memorijski mapirane).
+    """
+    mirror_dir = mirror_dir_for(filepath)
+    columns = meta['columns'] if columns is None else columns
+    return {column: np.load(_mirror_column_path(mirror_dir, column), mmap_mode=mmap_mode)[:meta['rows']] for column in columns}
+
+def load_dataset(filepath):
+    """
+    Vraća ceo skup podataka (sa konvertovanim tipovima, bez uklanjanja nedostajućih vrednosti)
+    iz binarnog odraza, koji se prethodno usklađuje sa CSV fajlom.
+    """
+    meta = sync_mirror(filepath)
+    return pd.DataFrame(read_mirror_columns(filepath, meta), columns=meta['columns'])
+
+# ---------------------------------------------------------------------------
+# Memorijski mapirane matrice za treniranje i skoring
+# - features.npy: kontinualna float32 matrica (redovi x FEATURE_COLUMNS)
+# - targets.npy: float64 matrica (redovi x TARGET_COLUMNS)
+# Redovi su već očišćeni i poređani kao posle train_test_split (prvo trening, pa test),
+# pa su trening i test skup samo pogledi (X[:n_train], X[n_train:]) bez kopiranja.
+# ---------------------------------------------------------------------------
+FEATURES_MATRIX_FILENAME = 'features.npy'
+TARGETS_MATRIX_FILENAME = 'targets.npy'
+MATRIX_META_FILENAME = 'matrix_meta.json'
+
+def valid_rows_mask(columns):
+    """
+    Maska redova bez nedostajućih vrednosti (isti kriterijum kao dropna u prepare_input_data).
+    """
+    mask = ~np.isnat(columns[DATETIME_COLUMN])
+    for column in FEATURE_COLUMNS + TARGET_COLUMNS:
+        mask &= ~np.isnan(columns[column])
+    return mask
+
+def _write_matrix(path, columns, column_names, rows, dtype):
+    # Matrica se popunjava kolonu po kolonu direktno u fajl (bez pravljenja DataFrame-a)
+    matrix = np.lib.format.open_memmap(path + '.tmp.npy', mode='w+', dtype=dtype, shape=(len(rows), len(column_names)))
+    for j, column in enumerate(column_names):
+        matrix[:, j] = columns[column][rows]
+    matrix.flush()
+    del matrix
+    os.replace(path + '.tmp.npy', path)
+
+def load_feature_matrix(filepath, test_size=None, random_state=None):
+    """
+    Vraća (X, y, n_train): memorijski mapirane matrice ulaza i ciljeva iz binarnog odraza.
+    - Sa zadatim test_size redovi su raspoređeni kao u train_test_split(test_size, random_state),
+      trening redovi su prvih n_train redova.
+    - Matrice se ponovo grade samo kada se promeni odraz ili parametri podele.
+    """
+    meta = sync_mirror(filepath)
+    index = sync_datetime_index(filepath, meta)
+    mirror_dir = mirror_dir_for(filepath)
+    features_path = os.path.join(mirror_dir, FEATURES_MATRIX_FILENAME)
+    targets_path = os.path.join(mirror_dir, TARGETS_MATRIX_FILENAME)
+    matrix_meta_path = os.path.join(mirror_dir, MATRIX_META_FILENAME)
+    key = {'offset': meta['offset'], 'fingerprint': meta['fingerprint'], 'test_size': test_size, 'random_state': random_state,
+           'deduplicate': True}
+
+    with _locked_mirror(mirror_dir):
+        try:
+            with open(matrix_meta_path) as f:
+                matrix_meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            matrix_meta = None
+
+        if matrix_meta is None or matrix_meta['key'] != key:
+            columns = read_mirror_columns(filepath, meta, mmap_mode='r')
+            # Za ponovljeno vreme važi poslednji upisani red (isto kao drop_duplicates u load_and_preprocess_data)
+            rows = index.latest_rows()
+            rows = rows[valid_rows_mask(columns)[rows]]
+            n_train = len(rows)
+            if test_size is not None:
+                train, test = train_test_split(np.arange(len(rows)), test_size=test_size, random_state=random_state)
+                rows = rows[np.concatenate([train, test])]
+                n_train = len(train)
+
+            _write_matrix(features_path, columns, FEATURE_COLUMNS, rows, FEATURE_DTYPE)
+            _write_matrix(targets_path, columns, TARGET_COLUMNS, rows, TARGET_DTYPE)
+            matrix_meta = {'key': key, 'rows': len(rows), 'n_train': n_train}
+            _write_mirror_meta_file(matrix_meta_path, matrix_meta)
+
+    X = np.load(features_path, mmap_mode='r')
+    y = np.load(targets_path, mmap_mode='r')
+    return X, y, matrix_meta['n_train']
+
+def features_to_matrix(data):
+    """
+    Pretvara DataFrame sa ulaznim parametrima u kontinualnu float32 matricu (oblik koji modeli očekuju).
+    """
+    return np.ascontiguousarray(data[FEATURE_COLUMNS].to_numpy(dtype=FEATURE_DTYPE))
@@ -0,0 +1,90 @@
+import io
+import os
+import threading
+import numpy as np
+import pandas as pd
+from models.data_preprocessing import prepare_input_data, read_latest_measurement, DATETIME_COLUMN
+
+"""
+Keš najnovijeg mjerenja unutar procesa.
+- Najnovije mjerenje se pri učitavanju (i kada se fajl izmeni ručno) traži preko indeksa po vremenu.
+- Novi redovi dodati na kraj fajla (/add) čitaju se inkrementalno, od poslednje pročitane pozicije.
+- Najnovije validno mjerenje (najveći Datetime) se čuva posebno, pa je predikcija za poslednji sat O(1).
+  Ispravka starijeg sata dopisana na kraj fajla (upsert, dopuna unazad) ga ne menja.
+"""
+
+# Broj bajtova pre pročitane pozicije koji se porede da bi se otkrila izmena postojećeg sadržaja
+FINGERPRINT_SIZE = 256
+
+
+class DatasetCache:
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._columns = None
+        self._latest = None  # Najnovije validno mjerenje (sve kolone)
+        self._offset = 0  # Broj pročitanih bajtova (uvek na granici celog reda)
+        self._fingerprint = b''
+
+    def _read_complete_lines(self, f, start):
+        # Čita od pozicije start do poslednjeg kompletnog reda (nedovršen red se ostavlja za sledeće čitanje)
+        f.seek(start)
+        raw = f.read()
+        end = raw.rfind(b'\n') + 1
+        return raw[:end]
+
+    def _take_fingerprint(self, f):
+        start = max(0, self._offset - FINGERPRINT_SIZE)
+        f.seek(start)
+        return f.read(self._offset - start)
+
+    def _add_chunk(self, data):
+        data = data.dropna()
+        if data.empty:
+            return
+        # Najnovije vreme u delu (za ponovljeno vreme poslednji upis); zamenjuje _latest samo ako nije starije
+        times = data[DATETIME_COLUMN].to_numpy()
+        newest = len(times) - 1 - int(np.argmax(times[::-1]))
+        if self._latest is None or times[newest] >= self._latest[DATETIME_COLUMN].to_numpy()[0]:
+            self._latest = data.iloc[[newest]].reset_index(drop=True)
+
+    def _load_latest(self, f):
+        # Najnovije mjerenje se traži preko indeksa po vremenu (poslednji red fajla može biti ispravka starijeg sata)
+        row, meta = read_latest_measurement(self.filepath)
+        self._columns = meta['columns']
+        self._offset = meta['offset']
+        self._latest = row
+        self._fingerprint = self._take_fingerprint(f)
+
+    def _load_new_rows(self, f):
+        raw = self._read_complete_lines(f, self._offset)
+        if not raw.strip():
+            self._offset += len(raw)
+            return
+        data = pd.read_csv(io.BytesIO(raw), header=None, names=self._columns)
+        self._offset += len(raw)
+        self._add_chunk(prepare_input_data(data))
+        self._fingerprint = self._take_fingerprint(f)
+
+    def refresh(self):
+        """
+        Usklađuje keš sa fajlom: inkrementalno čita dodate redove ili ponovo učitava najnovije mjerenje
+        ako je postojeći sadržaj izmenjen (fajl skraćen ili prepravljen).
+        """
+        with self._lock:
+            size = os.path.getsize(self.filepath)
+            with open(self.filepath, 'rb') as f:
+                changed = self._columns is None or size < self._offset or self._take_fingerprint(f) != self._fingerprint
+                if changed:
+                    self._load_latest(f)
+                elif size > self._offset:
+                    self._load_new_rows(f)
+
+    def latest_row(self):
+        """
+        Vraća najnovije validno mjerenje (sve kolone, uključujući Datetime) kao DataFrame sa jednim redom.
+        """
+        self.refresh()
+        if self._latest is None:
+            raise ValueError("Skup podataka ne sadrži nijedan validan red.")
+        return self._latest
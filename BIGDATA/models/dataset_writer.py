@@ -0,0 +1,41 @@
+import os
+from models.file_lock import file_lock
+
+"""
+Dopisivanje mjerenja na kraj CSV fajla skupa podataka.
+- Upis je zaštićen zaključavanjem fajla, pa se redovi iz više radnih procesa i istovremenih
+  zahteva nikad ne prepliću.
+- Svi redovi jednog poziva se upisuju jednim pozivom write na fajl otvoren u append režimu.
+- Čitaoci (DatasetCache, binarni odraz, poslednji red) uvek čitaju samo do poslednjeg znaka
+  za novi red, pa red koji je upravo u upisu ne vide dok nije kompletan.
+"""
+
+
+def append_lines(filepath, lines, locked=False):
+    """
+    Dopisuje kompletne redove (stringove bez znaka za novi red) na kraj fajla i vraća broj upisanih bajtova.
+    locked=True: pozivalac već drži file_lock(filepath) (npr. provera duplikata i upis pod istim zaključavanjem).
+    """
+    data = ''.join(f"{line}\n" for line in lines).encode('utf-8')
+    if not data:
+        return 0
+    if locked:
+        return _append_bytes(filepath, data)
+    with file_lock(filepath):
+        return _append_bytes(filepath, data)
+
+
+def _append_bytes(filepath, data):
+    with open(filepath, 'ab') as f:
+        # Fajl koji ne završava znakom za novi red (ručna izmena ili prekinut upis) se prvo zatvara,
+        # da se novi red ne nalepi na prethodni
+        size = f.seek(0, os.SEEK_END)
+        if size > 0:
+            with open(filepath, 'rb') as reader:
+                reader.seek(size - 1)
+                if reader.read(1) != b'\n':
+                    data = b'\n' + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(data)
@@ -0,0 +1,67 @@
+import numpy as np
+
+"""
+Indeks skupa podataka po koloni Datetime.
+- Vremena su sortirana (stabilno), uz svako vreme je broj reda u CSV fajlu, pa su pretraga
+  jednog vremena i opsega vremena O(log n) (np.searchsorted), bez prolaska kroz ceo skup.
+- Skup podataka se samo dopisuje, pa se ponovljeno vreme tretira kao ispravka (upsert):
+  važi poslednji upisani red za to vreme.
+"""
+
+
+class DatetimeIndex:
+    def __init__(self, times, rows):
+        self.times = times  # Sortirana vremena (datetime64), bez NaT
+        self.rows = rows  # Broj reda (u binarnom odrazu) za svako vreme; isti redosled kao times
+
+    def __len__(self):
+        return len(self.times)
+
+    def _as_times(self, values):
+        return np.asarray(values, dtype=self.times.dtype)
+
+    def lookup(self, timestamp):
+        """
+        Svi redovi sa zadatim vremenom, redom upisa (poslednji je važeći).
+        """
+        timestamp = self._as_times(timestamp)
+        start, end = np.searchsorted(self.times, timestamp, 'left'), np.searchsorted(self.times, timestamp, 'right')
+        return np.asarray(self.rows[start:end])
+
+    def contains(self, timestamps):
+        """
+        Maska vremena koja već postoje u indeksu (vektorski, O(m log n)).
+        """
+        timestamps = self._as_times(timestamps)
+        if len(self.times) == 0:
+            return np.zeros(len(timestamps), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.times, timestamps), len(self.times) - 1)
+        return np.asarray(self.times[positions] == timestamps)
+
+    def _last_occurrence(self, start, end):
+        # Maska poslednjeg pojavljivanja svakog vremena u odsečku [start, end) sortiranog niza
+        times = np.asarray(self.times[start:end])
+        last = np.ones(len(times), dtype=bool)
+        last[:-1] = times[:-1] != times[1:]
+        return last
+
+    def range(self, start=None, end=None):
+        """
+        Redovi sa vremenom u opsegu [start, end] (obe granice uključene), poređani po vremenu,
+        po jedan za svako vreme (poslednji upisani).
+        """
+        first = 0 if start is None else int(np.searchsorted(self.times, self._as_times(start), 'left'))
+        last = len(self.times) if end is None else int(np.searchsorted(self.times, self._as_times(end), 'right'))
+        return np.asarray(self.rows[first:last])[self._last_occurrence(first, last)]
+
+    def latest_rows(self):
+        """
+        Redovi koji važe posle uklanjanja duplikata (poslednji red za svako vreme), redom kao u fajlu.
+        """
+        return np.sort(self.range())
+
+    def duplicate_count(self):
+        """
+        Broj redova zamenjenih kasnijim upisom istog vremena (izostavljaju se iz treninga i upita).
+        """
+        return len(self) - int(self._last_occurrence(0, len(self)).sum())
@@ -0,0 +1,49 @@
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+"""
+Zaključavanje fajlova između procesa (više radnih procesa web aplikacije, komanda za treniranje).
+- Zaključava se poseban fajl <putanja>.lock, pa čitaoci samog fajla nikad nisu blokirani.
+- Na Linux/macOS se koristi fcntl.flock, a na Windows msvcrt.locking.
+"""
+
+LOCK_SUFFIX = '.lock'
+# Pauza između pokušaja na Windows-u (msvcrt.locking sam ponavlja pokušaj samo 10 puta)
+WINDOWS_RETRY_SECONDS = 0.05
+
+
+def lock_path_for(path):
+    return path + LOCK_SUFFIX
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Ekskluzivno zaključavanje fajla za vreme bloka with (čeka dok drugi proces ne otključa).
+    """
+    with open(lock_path_for(path), 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(WINDOWS_RETRY_SECONDS)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
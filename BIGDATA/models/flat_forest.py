@@ -0,0 +1,200 @@
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+"""
+Izvoz istreniranih šuma u ravne NumPy nizove i vektorska predikcija bez sklearn-a.
+- Sva stabla svih modela (lokacija) su u jednom nizu čvorova; list pokazuje sam na sebe,
+  pa se sva stabla za sve redove spuštaju istovremeno, tačno max_depth koraka.
+- StandardScaler se ugrađuje u pragove: za svaki čvor se računa najveća float32 vrednost sirovog
+  ulaza koja posle skaliranja ide levo, pa su odluke (i predikcije) iste kao kroz Pipeline.
+- Listovi stabala se sabiraju istim redosledom kao u RandomForestRegressor.predict.
+"""
+
+# Najveći broj redova koji se spušta kroz stabla odjednom (ograničava memoriju pomoćnih matrica)
+PREDICT_BATCH_ROWS = 4096
+
+
+def _scale_like_pipeline(values, mean, scale):
+    # Ista aritmetika kao StandardScaler.transform nad float32 ulazom (operacije u mestu, rezultat float32)
+    values = values.astype(np.float32)
+    values -= mean
+    values /= scale
+    return values
+
+
+# float32 vrednosti se porede preko celobrojnog ključa koji ima isti redosled kao same vrednosti,
+# pa se susedne float32 vrednosti dobijaju sabiranjem ključa sa 1
+_SIGN_BIT = 0x80000000
+_MAX_FLOAT32_KEY = 0x7F7FFFFF  # Najveći konačan float32
+
+
+def _float32_to_key(values):
+    bits = values.astype(np.float32).view(np.uint32).astype(np.int64)
+    return np.where(bits & _SIGN_BIT, -(bits & ~_SIGN_BIT), bits)
+
+
+def _key_to_float32(keys):
+    bits = np.where(keys < 0, -keys | _SIGN_BIT, keys).astype(np.uint32)
+    return bits.view(np.float32)
+
+
+def fold_scaler_thresholds(thresholds, mean, scale):
+    """
+    Pretvara pragove skaliranih ulaza u pragove sirovih float32 ulaza:
+    za svaki prag vraća najveće x za koje važi skalirano(x) <= prag.
+    Skaliranje je monotono, pa se granica traži binarnom pretragom po susednim float32 vrednostima.
+    """
+    def goes_left(keys):
+        return _scale_like_pipeline(_key_to_float32(keys), mean, scale) <= thresholds
+
+    estimate = _float32_to_key(np.clip(thresholds * scale + mean, -np.finfo(np.float32).max, np.finfo(np.float32).max))
+    low, high = estimate.copy(), estimate.copy()
+    step = np.ones_like(estimate)
+    # Proširivanje intervala dok levo od low ne ide levo, a high ne ide desno (koraci se udvostručuju)
+    while True:
+        bad = ~goes_left(low) & (low > -_MAX_FLOAT32_KEY)
+        if not bad.any():
+            break
+        low[bad] = np.maximum(low[bad] - step[bad], -_MAX_FLOAT32_KEY)
+        step[bad] *= 2
+    step[:] = 1
+    while True:
+        bad = goes_left(high) & (high < _MAX_FLOAT32_KEY)
+        if not bad.any():
+            break
+        high[bad] = np.minimum(high[bad] + step[bad], _MAX_FLOAT32_KEY)
+        step[bad] *= 2
+    low = np.where(goes_left(high), high, low)  # Prag iznad svih konačnih vrednosti
+    # Binarna pretraga: goes_left(low) je tačno, goes_left(high) nije
+    while True:
+        open_ = high - low > 1
+        if not open_.any():
+            break
+        middle = (low + high) // 2
+        left = goes_left(middle)
+        low = np.where(open_ & left, middle, low)
+        high = np.where(open_ & ~left, middle, high)
+    return _key_to_float32(low)
+
+
+def _pipeline_parts(model):
+    # (scaler ili None, šuma) iz Pipeline-a ili same šume; None ako model nije podržan
+    steps = getattr(model, 'named_steps', None)
+    if steps is None:
+        return (None, model) if isinstance(model, RandomForestRegressor) else None
+    forest = steps.get('regressor')
+    scaler = steps.get('scaler')
+    if not isinstance(forest, RandomForestRegressor) or len(steps) != (2 if scaler is not None else 1):
+        return None
+    if scaler is not None and not isinstance(scaler, StandardScaler):
+        return None
+    return scaler, forest
+
+
+def can_flatten(models):
+    return all(_pipeline_parts(model) is not None for model in models)
+
+
+class FlatForest:
+    def __init__(self, feature, threshold, children, value, roots, group_bounds, max_depth):
+        self.feature = feature  # Ulazni parametar po kome čvor deli (int32)
+        self.threshold = threshold  # Prag u jedinicama sirovog ulaza (float32); levo ako je x <= prag
+        self.children = children  # (broj čvorova, 2): levo i desno dete; list pokazuje sam na sebe
+        self.value = value  # (broj čvorova, broj izlaza po stablu): vrednost lista
+        self.roots = roots  # Koren svakog stabla
+        self.group_bounds = group_bounds  # Granice stabala po modelu: stabla modela i su [bounds[i], bounds[i+1])
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_models(cls, models):
+        """
+        Pravi ravan zapis od liste modela (Pipeline sa StandardScaler-om i RandomForestRegressor-om, ili sama šuma).
+        """
+        features, thresholds, children, values, roots = [], [], [], [], []
+        group_bounds = [0]
+        offset = 0
+        max_depth = 0
+        for model in models:
+            scaler, forest = _pipeline_parts(model)
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                is_leaf = tree.children_left < 0
+                node_ids = np.arange(tree.node_count)
+
+                feature = np.where(is_leaf, 0, tree.feature).astype(np.int32)
+                # Prag se prevodi u sirove float32 jedinice posebno za svaki ulazni parametar
+                # (i bez skaliranja, jer sklearn poredi float32 ulaz sa float64 pragom)
+                threshold = tree.threshold.copy()
+                split = ~is_leaf
+                mean = 0.0 if scaler is None else scaler.mean_[feature[split]]
+                scale = 1.0 if scaler is None else scaler.scale_[feature[split]]
+                threshold[split] = fold_scaler_thresholds(tree.threshold[split], mean, scale)
+                tree_children = np.column_stack([
+                    np.where(is_leaf, node_ids, tree.children_left),
+                    np.where(is_leaf, node_ids, tree.children_right),
+                ]) + offset
+
+                features.append(feature)
+                thresholds.append(np.where(is_leaf, np.inf, threshold).astype(np.float32))
+                children.append(tree_children.astype(np.int32))
+                values.append(tree.value[:, :, 0])
+                roots.append(offset)
+                offset += tree.node_count
+                max_depth = max(max_depth, tree.max_depth)
+            group_bounds.append(len(roots))
+
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(children),
+            np.ascontiguousarray(np.concatenate(values)), np.array(roots, dtype=np.int32),
+            np.array(group_bounds, dtype=np.int64), max_depth,
+        )
+
+    @property
+    def n_outputs(self):
+        return (len(self.group_bounds) - 1) * self.value.shape[1]
+
+    def _leaves(self, X):
+        # Spušta sve redove kroz sva stabla odjednom; vraća listove oblika (broj stabala, broj redova).
+        # Indeksi su ravni (np.take nad 1D nizovima), jer je to najjeftiniji oblik NumPy indeksiranja.
+        n_features = X.shape[1]
+        row_offsets = (np.arange(len(X), dtype=np.intp) * n_features)[None, :]
+        values = X.ravel()
+        children = self.children.ravel()
+        nodes = np.repeat(self.roots.astype(np.intp)[:, None], len(X), axis=1)
+        for _ in range(self.max_depth):
+            x = np.take(values, row_offsets + np.take(self.feature, nodes))
+            go_right = x > np.take(self.threshold, nodes)
+            nodes = np.take(children, 2 * nodes + go_right)
+        return nodes
+
+    def predict(self, X):
+        """
+        Vraća matricu predikcija (broj redova, broj izlaza): izlazi modela redom kao u listi models.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        predictions = np.empty((len(X), self.n_outputs))
+        outputs_per_tree = self.value.shape[1]
+        for start in range(0, len(X), PREDICT_BATCH_ROWS):
+            leaf_values = self.value[self._leaves(X[start:start + PREDICT_BATCH_ROWS])]  # (stabla, redovi, izlazi)
+            end = start + len(leaf_values[0])
+            for i in range(len(self.group_bounds) - 1):
+                first, last = self.group_bounds[i], self.group_bounds[i + 1]
+                # Zbir po stablima redom (kumulativni zbir sabira redom, kao u sklearn-u), pa deljenje brojem stabala
+                total = np.cumsum(leaf_values[first:last], axis=0)[-1]
+                predictions[start:end, i * outputs_per_tree:(i + 1) * outputs_per_tree] = total / (last - first)
+        return predictions
+
+    def save(self, path):
+        np.savez(path, feature=self.feature, threshold=self.threshold, children=self.children, value=self.value,
+                 roots=self.roots, group_bounds=self.group_bounds, max_depth=self.max_depth)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['feature'], data['threshold'], data['children'], data['value'],
+                       data['roots'], data['group_bounds'], data['max_depth'])
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in (self.feature, self.threshold, self.children, self.value, self.roots))
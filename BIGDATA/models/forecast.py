@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from models.data_preprocessing import (features_to_matrix, load_time_series, resample_production, sync_datetime_index,
+                                      DATETIME_COLUMN, FEATURE_COLUMNS, FEATURE_DTYPE, TARGET_COLUMNS)
+from config import FORECAST_HISTORY_DAYS
+
+"""
+Prognoza proizvodnje za naredne sate (npr. 24 ili 48) za sve lokacije.
+- Ulaz je blok budućih vremenskih podataka (prognoza vremena), ili se oni procenjuju iz istorije:
+  za svaki sat u danu prosek istog sata u poslednjih FORECAST_HISTORY_DAYS dana mjerenja.
+- Svi sati se predviđaju jednim pozivom predict (ModelSet), a dnevni i mjesečni zbir se računaju
+  iz satnog vektora (resample_production), bez posebnih zahteva po satu.
+"""
+
+
+def future_times(last_time, hours):
+    """
+    Vremena narednih hours sati posle last_time.
+    """
+    return np.datetime64(last_time) + np.arange(1, hours + 1) * np.timedelta64(1, 'h')
+
+
+def weather_from_history(filepath, hours, history_days=FORECAST_HISTORY_DAYS):
+    """
+    Vremenski podaci za narednih hours sati posle poslednjeg mjerenja, iz istorije: za svaki sat u danu
+    prosek ulaznih parametara istog sata u poslednjih history_days dana mjerenja (sezonski naivna prognoza).
+    Istorija se čita preko indeksa po vremenu (samo poslednjih history_days * 24 redova).
+    Baca ValueError ako nema mjerenja ili nekom satu u danu nedostaje istorija.
+    """
+    index = sync_datetime_index(filepath)
+    if not len(index):
+        raise ValueError("Skup podataka nema mjerenja.")
+    start = index.times[max(0, len(index) - history_days * 24)]
+    history = load_time_series(filepath, start=start, columns=FEATURE_COLUMNS)
+    if history.empty:
+        raise ValueError("Skup podataka nema validnih mjerenja.")
+
+    times = pd.DatetimeIndex(future_times(history.index[-1], hours))
+    profile = history[FEATURE_COLUMNS].groupby(history.index.hour).mean()
+    weather = profile.reindex(times.hour)
+    if weather.isna().any(axis=None):
+        raise ValueError("Nema dovoljno istorije mjerenja za sve sate u danu.")
+    weather = weather.astype(FEATURE_DTYPE).reset_index(drop=True)
+    weather.insert(0, DATETIME_COLUMN, times)
+    return weather
+
+
+def forecast(model_set, weather):
+    """
+    Predikcija za blok budućih sati (kolone Datetime i FEATURE_COLUMNS) jednim pozivom predict.
+    Vraća (satna, dnevna, mjesečna) proizvodnja kao DataFrame-ovi sa indeksom po vremenu
+    i kolonama TARGET_COLUMNS + 'Total Production'.
+    """
+    weather = weather.sort_values(DATETIME_COLUMN, kind='stable')
+    predictions = model_set.predict(features_to_matrix(weather))
+    hourly = pd.DataFrame(predictions, columns=TARGET_COLUMNS, index=pd.DatetimeIndex(weather[DATETIME_COLUMN], name=DATETIME_COLUMN))
+    daily = resample_production(hourly, 'D')
+    monthly = resample_production(hourly, 'MS')
+    hourly['Total Production'] = predictions.sum(axis=1)
+    return hourly, daily, monthly
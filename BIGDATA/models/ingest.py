@@ -0,0 +1,163 @@
+import json
+import numpy as np
+import pandas as pd
+from models.data_preprocessing import (parse_datetime_column, sync_datetime_index, DATASET_COLUMNS, DATETIME_COLUMN,
+                                      FEATURE_COLUMNS, TARGET_COLUMNS)
+from models.dataset_writer import append_lines
+from models.file_lock import file_lock
+from models.validation import validate_measurements
+
+"""
+Grupni unos mjerenja (npr. izvoz iz SCADA sistema).
+- Ulaz se čita u delovima (CSV ili NDJSON tok), pa se ceo zahtev nikad ne drži u memoriji kao DataFrame.
+- Svaki deo se validira vektorski (models.validation), sa istim pravilima kao forma /add.
+- Brojevi se parsiraju jednom, kao float64: iste vrednosti se validiraju i upisuju (u float32 se
+  pretvaraju tek u binarnom odrazu), pa zaokruživanje ne može da propusti vrednost van granica.
+- Validni redovi se upisuju sa datumom u ISO formatu i na kraju dopisuju u skup podataka
+  jednim zaključanim upisom.
+- Vreme koje već postoji se odbija ili, u upsert režimu, upisuje kao ispravka (važi poslednji upis).
+"""
+
+# Datum se upisuje u ISO formatu do minuta (isti format kao iz forme /add: '%Y-%m-%dT%H:%M')
+INGEST_DATETIME_UNIT = 'datetime64[m]'
+
+# Obrada mjerenja za vreme koje već postoji u skupu podataka
+ON_DUPLICATE_REJECT = 'reject'
+ON_DUPLICATE_UPSERT = 'upsert'
+DUPLICATE_DATETIME_MESSAGE = "Mjerenje za ovaj datum i vreme već postoji."
+
+
+def iter_csv_batches(stream, chunk_rows):
+    """
+    Čita CSV tok (sa zaglavljem) u delovima od chunk_rows redova.
+    Brojevi se parsiraju C parserom; kolona sa nevalidnim vrednostima ostaje tekstualna i validira se kasnije.
+    """
+    for chunk in pd.read_csv(stream, dtype={DATETIME_COLUMN: str}, chunksize=chunk_rows, skipinitialspace=True):
+        yield chunk
+
+
+def iter_ndjson_batches(stream, chunk_rows):
+    """
+    Čita NDJSON tok (jedan JSON objekat po redu) u delovima od chunk_rows redova.
+    """
+    records = []
+    for line in stream:
+        if line.strip():
+            records.append(json.loads(line))
+        if len(records) >= chunk_rows:
+            yield pd.DataFrame.from_records(records)
+            records = []
+    if records:
+        yield pd.DataFrame.from_records(records)
+
+
+def iter_json_batches(rows, chunk_rows):
+    """
+    Deli već učitanu JSON listu redova na delove od chunk_rows redova.
+    """
+    for start in range(0, len(rows), chunk_rows):
+        yield pd.DataFrame.from_records(rows[start:start + chunk_rows])
+
+
+# Najveća vrednost za koju float64 tačno predstavlja svaki ceo broj (2^53)
+_MAX_EXACT_INTEGER = 2.0 ** 53
+
+
+def format_numbers(values):
+    """
+    Tekst float64 vrednosti bez gubitka preciznosti (najkraći zapis koji se čita kao ista vrednost), vektorski.
+    Celi brojevi (česti u mjerenjima, npr. 0) se formatiraju preko int64, što je višestruko brže.
+    """
+    whole = (values == np.round(values)) & (np.abs(values) < _MAX_EXACT_INTEGER)
+    text = np.empty(len(values), dtype=object)
+    text[whole] = values[whole].astype(np.int64).astype(str)
+    text[~whole] = values[~whole].astype(str)
+    return text.tolist()
+
+
+def parse_batch(data):
+    """
+    Kolone skupa podataka iz ulaza, svaka parsirana jednom: Datetime kao datetime64, brojevi kao float64.
+    Nevalidne vrednosti postaju NaT/NaN.
+    """
+    parsed = {DATETIME_COLUMN: parse_datetime_column(data[DATETIME_COLUMN]).to_numpy()}
+    for column in FEATURE_COLUMNS + TARGET_COLUMNS:
+        parsed[column] = pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=np.float64)
+    return pd.DataFrame(parsed)
+
+
+def prepare_batch(data, max_reported_rows=None, row_offset=0):
+    """
+    Konvertuje deo ulaza u tipove skupa podataka i vraća (CSV redovi validnih mjerenja, njihova vremena,
+    njihovi brojevi redova u ulazu (od 0), izveštaj o greškama nevalidnih redova).
+    Baca ValueError ako neka kolona nedostaje.
+    """
+    missing_columns = [column for column in DATASET_COLUMNS if column not in data.columns]
+    if missing_columns:
+        raise ValueError(f"Nedostaju kolone: {', '.join(missing_columns)}")
+
+    data = parse_batch(data.reset_index(drop=True))
+    invalid, report = validate_measurements(data, max_reported_rows, row_offset)
+
+    valid = ~invalid
+    # Vremena se svode na jedinicu u kojoj se upisuju, pa provera duplikata vidi isto vreme koje će biti upisano
+    times = data[DATETIME_COLUMN].to_numpy()[valid].astype(INGEST_DATETIME_UNIT)
+    columns = [np.datetime_as_string(times).tolist()]
+    # Redovi se pišu iz istih validiranih vrednosti, nikad iz ulaznog teksta (npr. "5\n" bi prelomio red u CSV-u)
+    columns += [format_numbers(data[column].to_numpy()[valid]) for column in FEATURE_COLUMNS + TARGET_COLUMNS]
+    lines = list(map(','.join, zip(*columns)))
+    return lines, times, np.flatnonzero(valid) + row_offset, report
+
+
+def duplicate_mask(index, times):
+    """
+    Maska vremena koja već postoje u skupu podataka ili se ponavljaju ranije u istom unosu.
+    """
+    duplicate = index.contains(times)
+    _, first = np.unique(times, return_index=True)
+    repeated = np.ones(len(times), dtype=bool)
+    repeated[first] = False
+    return duplicate | repeated
+
+
+def ingest_batches(filepath, batches, max_reported_rows=100, on_duplicate=ON_DUPLICATE_REJECT):
+    """
+    Validira sve delove ulaza, pa validne redove dopisuje u skup podataka jednim upisom.
+    - on_duplicate='reject': redovi sa vremenom koje već postoji (u skupu ili ranije u unosu) se odbijaju.
+    - on_duplicate='upsert': takvi redovi se upisuju i zamenjuju ranija mjerenja za isto vreme.
+    Vraća izveštaj: broj primljenih, upisanih i odbijenih redova i greške za prvih max_reported_rows
+    odbijenih redova (brojevi redova od 1, u celom ulazu).
+    """
+    if on_duplicate not in (ON_DUPLICATE_REJECT, ON_DUPLICATE_UPSERT):
+        raise ValueError(f"Nepoznat način obrade duplikata: '{on_duplicate}'.")
+
+    lines, times, input_rows = [], [], []
+    received = 0
+    rejected_rows = []
+    for data in batches:
+        batch_lines, batch_times, batch_rows, report = prepare_batch(data, max_reported_rows - len(rejected_rows), received)
+        lines.extend(batch_lines)
+        times.append(batch_times)
+        input_rows.append(batch_rows)
+        rejected_rows.extend(report)
+        received += len(data)
+
+    # Provera duplikata i upis pod istim zaključavanjem, da dva istovremena unosa ne upišu isto vreme
+    with file_lock(filepath):
+        if on_duplicate == ON_DUPLICATE_REJECT and lines:
+            times, input_rows = np.concatenate(times), np.concatenate(input_rows)
+            duplicate = duplicate_mask(sync_datetime_index(filepath), times)
+            rejected_rows.extend(
+                {'row': int(row) + 1, 'errors': [{'column': DATETIME_COLUMN, 'message': DUPLICATE_DATETIME_MESSAGE}]}
+                for row in input_rows[duplicate][:max_reported_rows]
+            )
+            lines = [line for line, keep in zip(lines, ~duplicate) if keep]
+        append_lines(filepath, lines, locked=True)
+
+    rejected_rows.sort(key=lambda row: row['row'])
+    return {
+        'received': received,
+        'appended': len(lines),
+        'rejected': received - len(lines),
+        'rejected_rows': rejected_rows[:max_reported_rows],
+    }
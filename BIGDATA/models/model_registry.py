@@ -0,0 +1,108 @@
+import threading
+import time
+import traceback
+from models.model_set import load_model_set
+from models.model_store import load_metadata, read_latest_version, set_latest_version, version_dir
+
+"""
+Registar modela: drži aktivni skup modela (ModelSet) sa identifikatorom verzije.
+- Nova verzija se učitava sa diska u pozadini, a aktivira se jednom dodelom reference,
+  pa zahtevi koji su već uzeli prethodni skup modela završavaju sa njim (bez mešanja verzija).
+- LATEST pokazivač se povremeno proverava, pa se verzija koju je istrenirao drugi proces
+  (komanda za treniranje ili drugi radni proces) aktivira bez ponovnog pokretanja aplikacije.
+"""
+
+
+class ModelRegistry:
+    def __init__(self, artifacts_dir, poll_interval=5.0):
+        self.artifacts_dir = artifacts_dir
+        self.poll_interval = poll_interval
+        self._current = None
+        self._load_lock = threading.Lock()  # Najviše jedno učitavanje u isto vreme
+        self._last_poll = 0.0
+        self.on_activate = []  # Funkcije koje se pozivaju sa novim skupom modela posle aktivacije
+
+    @property
+    def current(self):
+        """
+        Aktivni skup modela. Zahtev treba da ga uzme jednom i koristi do kraja.
+        """
+        if self._current is None:
+            raise RuntimeError("Nijedna verzija modela nije učitana.")
+        return self._current
+
+    @property
+    def version(self):
+        return None if self._current is None else self._current.version
+
+    def swap(self, model_set):
+        """
+        Aktivira novi skup modela (jedna dodela reference) i vraća prethodni.
+        """
+        previous, self._current = self._current, model_set
+        print(f"Aktivna verzija modela: {model_set.version}")
+        for callback in self.on_activate:
+            try:
+                callback(model_set)
+            except Exception:
+                traceback.print_exc()
+        return previous
+
+    def load_version(self, version):
+        """
+        Učitava zadatu verziju sa diska i aktivira je.
+        """
+        with self._load_lock:
+            if version == self.version:
+                return self._current
+            model_set = load_model_set(self.artifacts_dir, version)
+            self.swap(model_set)
+            return model_set
+
+    def load_latest(self):
+        """
+        Učitava verziju na koju pokazuje LATEST. Baca FileNotFoundError ako modeli ne postoje.
+        """
+        version = read_latest_version(self.artifacts_dir)
+        if version is None:
+            raise FileNotFoundError(f"Nema sačuvanih modela u '{self.artifacts_dir}'. Pokrenite: python -m models.train_model")
+        return self.load_version(version)
+
+    def load_async(self, version=None):
+        """
+        Učitava verziju (podrazumevano LATEST) u pozadinskoj niti; aktivni modeli se koriste dok se ne završi.
+        """
+        def load():
+            try:
+                if version is None:
+                    self.load_latest()
+                else:
+                    self.load_version(version)
+            except Exception:
+                traceback.print_exc()
+
+        thread = threading.Thread(target=load, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def promote(self, version):
+        """
+        Postavlja LATEST na zadatu verziju (npr. povratak na prethodnu) i učitava je u pozadini.
+        Ostali radni procesi je preuzimaju pri sledećoj proveri LATEST pokazivača.
+        """
+        version_dir(self.artifacts_dir, version)  # ValueError za neispravnu oznaku, FileNotFoundError za nepostojeću
+        load_metadata(self.artifacts_dir, version)
+        set_latest_version(self.artifacts_dir, version)
+        return self.load_async(version)
+
+    def reload_if_updated(self):
+        """
+        Najviše jednom u poll_interval sekundi proverava LATEST i, ako je promenjen, učitava ga u pozadini.
+        """
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        self._last_poll = now
+        latest = read_latest_version(self.artifacts_dir)
+        if latest is not None and latest != self.version and not self._load_lock.locked():
+            self.load_async(latest)
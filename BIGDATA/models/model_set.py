@@ -0,0 +1,89 @@
+import os
+import tempfile
+import numpy as np
+from models.data_preprocessing import TARGET_COLUMNS
+from models.flat_forest import FlatForest, can_flatten
+from models.model_store import load_models, artifact_path
+from config import USE_FLAT_FOREST, FLAT_FOREST_MAX_ROWS
+
+"""
+Skup modela za sve lokacije, nezavisno od toga kako je istreniran:
+- 'per_location': po jedan model za svaku lokaciju (TARGET_COLUMNS redom)
+- 'multi_output': jedan model sa više izlaza (jedan prolaz kroz stabla daje predikcije za sve lokacije)
+Mali zahtevi (npr. jedan red) se računaju preko ravnog zapisa šuma (FlatForest) ako postoji,
+a veće grupe redova preko sklearn modela - rezultati su isti.
+"""
+
+PER_LOCATION = 'per_location'
+MULTI_OUTPUT = 'multi_output'
+
+# Ravan zapis šuma uz verziju modela (artifacts/<verzija>/flat_forest.npz)
+FLAT_FOREST_FILENAME = 'flat_forest.npz'
+
+
+class ModelSet:
+    def __init__(self, models, metadata, flat_forest=None):
+        self.models = list(models)
+        self.metadata = metadata
+        self.flat_forest = flat_forest
+        self.version = metadata.get('version')
+        self.kind = metadata.get('kind', PER_LOCATION)
+        self.targets = metadata.get('targets', TARGET_COLUMNS)
+
+    def predict(self, X):
+        """
+        Vraća matricu predikcija oblika (broj redova, broj lokacija).
+        """
+        if self.flat_forest is not None and len(X) <= FLAT_FOREST_MAX_ROWS:
+            return self.flat_forest.predict(X)
+        if self.kind == MULTI_OUTPUT:
+            predictions = self.models[0].predict(X)
+            return predictions.reshape(len(X), len(self.targets))
+        return np.column_stack([model.predict(X) for model in self.models])
+
+    def feature_importances(self):
+        """
+        Važnost ulaznih parametara za svaku lokaciju (lista nizova, redosled kao targets).
+        Model sa više izlaza ima zajedničku važnost za sve lokacije.
+        Modeli bez feature_importances_ (HGB) koriste permutacionu važnost sačuvanu pri treniranju.
+        """
+        if 'feature_importances' in self.metadata:
+            importances = [np.array(values) for values in self.metadata['feature_importances']]
+            return importances * len(self.targets) if self.kind == MULTI_OUTPUT else importances
+        if self.kind == MULTI_OUTPUT:
+            return [self.models[0].named_steps['regressor'].feature_importances_] * len(self.targets)
+        return [model.named_steps['regressor'].feature_importances_ for model in self.models]
+
+
+def export_flat_forest(models, artifacts_dir, version):
+    """
+    Izvozi šume verzije u ravan zapis (flat_forest.npz) i vraća ga; None ako modeli nisu šume.
+    """
+    if not can_flatten(models):
+        return None
+    flat_forest = FlatForest.from_models(models)
+    path = artifact_path(artifacts_dir, version, FLAT_FOREST_FILENAME)
+    # Jedinstven privremeni fajl: više procesa može istovremeno izvoziti istu verziju (npr. starija verzija bez zapisa)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.npz')
+    os.close(fd)
+    try:
+        flat_forest.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return flat_forest
+
+
+def load_model_set(artifacts_dir, version):
+    """
+    Učitava verziju modela zajedno sa ravnim zapisom šuma (pravi ga ako ne postoji, npr. za starije verzije).
+    """
+    models, metadata = load_models(artifacts_dir, version)
+    flat_forest = None
+    if USE_FLAT_FOREST and can_flatten(models):
+        try:
+            flat_forest = FlatForest.load(artifact_path(artifacts_dir, version, FLAT_FOREST_FILENAME))
+        except FileNotFoundError:
+            flat_forest = export_flat_forest(models, artifacts_dir, version)
+    return ModelSet(models, metadata, flat_forest)
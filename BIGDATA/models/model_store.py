@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+import time
+import joblib
+
+"""
+Skladište istreniranih modela (artefakata).
+- Svaka verzija se čuva u posebnom direktorijumu: artifacts/<verzija>/models.joblib + metadata.json
+- Verzija sadrži heš skupa podataka i hiperparametara, pa se isti trening ne ponavlja.
+- Fajl LATEST pokazuje na verziju koju aplikacija učitava pri pokretanju.
+"""
+
+MODELS_FILENAME = 'models.joblib'
+METADATA_FILENAME = 'metadata.json'
+LATEST_FILENAME = 'LATEST'
+
+
+def compute_dataset_hash(filepath, chunk_size=1024 * 1024):
+    """
+    Računa SHA-256 heš CSV fajla (čita se u blokovima, bez učitavanja celog fajla u memoriju).
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_params_hash(params):
+    """
+    Računa heš hiperparametara (sortirani JSON, da redosled ključeva ne utiče na heš).
+    """
+    encoded = json.dumps(params, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def make_version_id(dataset_hash, params_hash):
+    """
+    Verzija = vreme treniranja + skraćeni heševi podataka i parametara.
+    """
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{dataset_hash[:10]}-{params_hash[:8]}"
+
+
+def _write_atomic(path, data, mode='w'):
+    # Upis u privremeni fajl pa zamena, da čitalac nikad ne vidi polovično upisan fajl
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def save_models(models, metadata, artifacts_dir, finalize=None, activate=True):
+    """
+    Čuva modele i metapodatke kao novu verziju i pomera LATEST pokazivač na nju (osim uz activate=False).
+    finalize(version) se poziva pre pomeranja pokazivača, za dodatne fajlove verzije (npr. ravan zapis šuma),
+    da ih aplikacija nađe čim vidi novu verziju. Vraća identifikator verzije.
+    """
+    version = make_version_id(metadata['dataset_hash'], metadata['params_hash'])
+    version_dir = os.path.join(artifacts_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    metadata = dict(metadata, version=version, created_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+    joblib.dump(models, os.path.join(version_dir, MODELS_FILENAME))
+    _write_atomic(os.path.join(version_dir, METADATA_FILENAME), json.dumps(metadata, indent=2, default=str))
+    if finalize is not None:
+        finalize(version)
+
+    # Pokazivač se menja tek kada je verzija kompletno upisana
+    if activate:
+        set_latest_version(artifacts_dir, version)
+    return version
+
+
+def set_latest_version(artifacts_dir, version):
+    """
+    Pomera LATEST pokazivač na zadatu (već sačuvanu) verziju.
+    """
+    _write_atomic(os.path.join(artifacts_dir, LATEST_FILENAME), version)
+
+
+def artifact_path(artifacts_dir, version, filename):
+    """
+    Putanja do dodatnog fajla uz verziju modela (npr. keširani grafovi).
+    """
+    return os.path.join(artifacts_dir, version, filename)
+
+
+def save_artifact_json(path, data):
+    _write_atomic(path, json.dumps(data))
+
+
+def read_latest_version(artifacts_dir):
+    """
+    Vraća identifikator poslednje sačuvane verzije ili None ako nijedna ne postoji.
+    """
+    try:
+        with open(os.path.join(artifacts_dir, LATEST_FILENAME)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def version_dir(artifacts_dir, version):
+    """
+    Direktorijum verzije u artifacts_dir. Baca ValueError ako oznaka nije ime direktorijuma
+    (npr. broj ili putanja poput '../...') i FileNotFoundError ako verzija ne postoji.
+    """
+    if not isinstance(version, str) or version in ('', '.', '..') or any(sep in version for sep in '/\\'):
+        raise ValueError(f"Neispravna oznaka verzije modela: {version!r}.")
+    path = os.path.join(artifacts_dir, version)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Verzija modela '{version}' ne postoji.")
+    return path
+
+
+def load_metadata(artifacts_dir, version):
+    with open(os.path.join(artifacts_dir, version, METADATA_FILENAME)) as f:
+        return json.load(f)
+
+
+def load_models(artifacts_dir, version):
+    """
+    Učitava modele i metapodatke za zadatu verziju.
+    """
+    models = joblib.load(os.path.join(artifacts_dir, version, MODELS_FILENAME))
+    return models, load_metadata(artifacts_dir, version)
+
+
+def find_version(artifacts_dir, dataset_hash, params_hash):
+    """
+    Traži postojeću verziju istreniranu nad istim podacima i istim hiperparametrima.
+    """
+    if not os.path.isdir(artifacts_dir):
+        return None
+    for version in sorted(os.listdir(artifacts_dir), reverse=True):
+        metadata_path = os.path.join(artifacts_dir, version, METADATA_FILENAME)
+        if not os.path.isfile(metadata_path):
+            continue
+        metadata = load_metadata(artifacts_dir, version)
+        if metadata.get('dataset_hash') == dataset_hash and metadata.get('params_hash') == params_hash:
+            return version
+    return None
@@ -0,0 +1,68 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+"""
+Keš rezultata predikcije u memoriji procesa.
+- Ključ je (verzija modela, heš ulaznog reda), pa nova verzija modela nikad ne vraća stari rezultat.
+- Broj stavki je ograničen (izbacuje se najdavnije korišćena), a stavka ističe posle ttl_seconds.
+"""
+
+
+def feature_key(model_version, features):
+    """
+    Ključ keša za matricu ulaznih parametara (heš bajtova float32 matrice i njenog oblika).
+    """
+    features = np.ascontiguousarray(features)
+    digest = hashlib.sha1(str(features.shape).encode('utf-8'))
+    digest.update(features.tobytes())
+    return model_version, digest.hexdigest()
+
+
+class PredictionCache:
+    def __init__(self, max_entries=256, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # ključ -> (vreme upisa, vrednost), redosled = poslednja upotreba
+
+    def get(self, key):
+        """
+        Vraća sačuvanu vrednost ili None (ako je nema ili je istekla).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """
+        Vraća vrednost iz keša, a ako je nema računa je (van zaključavanja) i čuva.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
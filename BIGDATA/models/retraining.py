@@ -0,0 +1,87 @@
+import threading
+import time
+import traceback
+
+"""
+Pozadinsko ponovno treniranje modela kada se dodaju nova mjerenja.
+- Novi redovi (iz /add) se samo broje; trening se pokreće kada ih se skupi dovoljno
+  ili kada najstariji neobrađeni red postane prestar.
+- Trening se izvršava u posebnoj niti, pa zahtevi nisu blokirani; novi skup modela
+  se predaje aplikaciji tek kada je kompletno istreniran i sačuvan.
+"""
+
+
+class RetrainingScheduler:
+    def __init__(self, train_fn, on_new_models, min_new_rows, max_age_seconds, check_interval=60):
+        self.train_fn = train_fn  # Trenira i čuva modele, vraća novu verziju
+        self.on_new_models = on_new_models  # Aktivira novu verziju u aplikaciji
+        self.min_new_rows = min_new_rows
+        self.max_age_seconds = max_age_seconds
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pending_rows = 0
+        self._first_pending_at = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name="retraining-scheduler", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def notify_new_rows(self, count=1):
+        """
+        Beleži nove redove u skupu podataka; nit se pokreće pri prvom pozivu.
+        """
+        with self._lock:
+            self._pending_rows += count
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            ready = self._pending_rows >= self.min_new_rows
+        self.start()
+        if ready:
+            self._wakeup.set()
+
+    def _take_pending(self):
+        # Vraća broj redova za koje treba trenirati (0 ako pragovi još nisu dostignuti)
+        with self._lock:
+            if self._pending_rows == 0:
+                return 0
+            age = time.monotonic() - self._first_pending_at
+            if self._pending_rows < self.min_new_rows and age < self.max_age_seconds:
+                return 0
+            pending, self._pending_rows, self._first_pending_at = self._pending_rows, 0, None
+            return pending
+
+    def _restore_pending(self, pending):
+        # Trening nije uspeo - redovi ostaju na čekanju za sledeći pokušaj
+        with self._lock:
+            self._pending_rows += pending
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.check_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+
+            pending = self._take_pending()
+            if not pending:
+                continue
+
+            print(f"Ponovno treniranje modela ({pending} novih redova)...")
+            try:
+                self.on_new_models(self.train_fn())
+            except Exception:
+                traceback.print_exc()
+                self._restore_pending(pending)
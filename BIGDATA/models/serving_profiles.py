@@ -0,0 +1,152 @@
+import argparse
+import copy
+import numpy as np
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from models.data_preprocessing import TARGET_COLUMNS
+from models.flat_forest import FlatForest, can_flatten
+from models.model_set import ModelSet, PER_LOCATION, load_model_set
+from models.train_model import evaluate_model, fit_models, load_training_data, measure_latency, model_size, train_and_save, RANDOM_FOREST
+from config import (DATA_PATH, ARTIFACTS_DIR, MODEL_PARAMS, SPLIT_RANDOM_STATE, USE_MEMMAP, TRAIN_WORKERS, USE_FLAT_FOREST,
+                    SERVING_PROFILES, SERVING_MAE_TOLERANCE, SERVING_VALIDATION_SIZE)
+
+"""
+Profili za posluživanje: manje i brže šume po lokaciji, uz izveštaj o ceni u tačnosti.
+- 'full': šuma iz MODEL_PARAMS (referenca; profili su uvek šume, nezavisno od MODEL_BACKEND).
+- Orezane šume (SERVING_PROFILES): ograničena dubina i veličina listova; broj stabala se za svaku lokaciju
+  bira krivom validacije - najmanji broj stabala od kog validaciona MAE ostaje u granici
+  SERVING_MAE_TOLERANCE od MAE svih stabala.
+Svi profili se treniraju na istom delu trening skupa (ostatak je za validaciju), porede na test skupu,
+a vreme predikcije se meri kao u aplikaciji (ModelSet sa ravnim zapisom šuma).
+Izabrani profili (po jedan za svaku lokaciju) se treniraju na celom trening skupu i čuvaju kao nova verzija
+modela (train_and_save sa parametrima po lokacijama), koja se aktivira preko /api/models/reload ili uz --activate.
+Pokretanje: python -m models.serving_profiles (iz BIGDATA direktorijuma).
+"""
+
+FULL_PROFILE = 'full'
+
+
+def tree_count_curve(model, X_val, y_val):
+    """
+    Kriva validacije po broju stabala: MAE šume od prvih k stabala, za k = 1..broj stabala.
+    Svako stablo predviđa jednom, a šume od k stabala su kumulativni proseci.
+    """
+    forest = model.named_steps['regressor']
+    X_val = model[:-1].transform(X_val) if len(model.steps) > 1 else X_val
+    tree_predictions = np.array([tree.predict(X_val) for tree in forest.estimators_])
+    means = np.cumsum(tree_predictions, axis=0) / np.arange(1, len(tree_predictions) + 1)[:, None]
+    return np.abs(means - y_val).mean(axis=1)
+
+
+def truncate_forest(model, n_trees):
+    """
+    Isti model sa samo prvih n_trees stabala (bez ponovnog treniranja).
+    """
+    forest = copy.copy(model.named_steps['regressor'])
+    forest.estimators_ = forest.estimators_[:n_trees]
+    forest.n_estimators = n_trees
+    return Pipeline(model.steps[:-1] + [('regressor', forest)])
+
+
+def prune_tree_count(model, X_val, y_val, tolerance=SERVING_MAE_TOLERANCE):
+    """
+    Skraćuje šumu na najmanji broj stabala od kog kriva validacije ostaje u granici tolerancije
+    (i za sve veće brojeve stabala, da slučajan pad krive kod malog broja stabala ne bude izabran).
+    Vraća (model, broj stabala).
+    """
+    curve = tree_count_curve(model, X_val, y_val)
+    outside = np.flatnonzero(curve > curve[-1] * (1 + tolerance))
+    n_trees = int(outside[-1]) + 2 if len(outside) else 1
+    return truncate_forest(model, n_trees), n_trees
+
+
+def serving_model_set(models, targets):
+    """
+    ModelSet kakav aplikacija koristi (load_model_set): uz šume i ravan zapis za male zahteve.
+    """
+    flat_forest = FlatForest.from_models(models) if USE_FLAT_FOREST and can_flatten(models) else None
+    return ModelSet(models, {'kind': PER_LOCATION, 'targets': targets}, flat_forest)
+
+
+def build_serving_profiles(filepath=DATA_PATH, artifacts_dir=ARTIFACTS_DIR, memmap=USE_MEMMAP, workers=TRAIN_WORKERS, activate=False):
+    """
+    Trenira sve profile, štampa MAE/R² (evaluate_model), vreme predikcije i veličinu za svaku lokaciju,
+    bira najmanji profil čija validaciona MAE je u granici tolerancije od pune šume i čuva izabrane
+    profile kao novu verziju modela (activate=True je i aktivira pomeranjem LATEST pokazivača).
+    Vraća {lokacija: {profil: rezultati}}, {lokacija: izabrani profil} i oznaku sačuvane verzije.
+    """
+    X_train, X_test, y_train, y_test = load_training_data(filepath, memmap)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=SERVING_VALIDATION_SIZE, random_state=SPLIT_RANDOM_STATE)
+
+    # Modeli svih profila: {profil: (lista modela po lokacijama, parametri po lokacijama)}
+    print(f"\n--- PROFIL {FULL_PROFILE} ---")
+    full_models = fit_models(PER_LOCATION, MODEL_PARAMS, X_fit, y_fit, workers, backend=RANDOM_FOREST)
+    profiles = {FULL_PROFILE: (full_models, [dict(MODEL_PARAMS)] * len(full_models))}
+    for name, overrides in SERVING_PROFILES.items():
+        print(f"\n--- PROFIL {name} ---")
+        params = {**MODEL_PARAMS, **overrides}
+        models, location_params = [], []
+        for i, model in enumerate(fit_models(PER_LOCATION, params, X_fit, y_fit, workers, backend=RANDOM_FOREST)):
+            model, n_trees = prune_tree_count(model, X_val, y_val[:, i])
+            models.append(model)
+            location_params.append({**params, 'n_estimators': n_trees})
+        profiles[name] = (models, location_params)
+
+    results, recommended = {}, {}
+    for i, column in enumerate(TARGET_COLUMNS):
+        print(f"\n--- LOKACIJA {i+1} ({column}) ---")
+        results[column] = {}
+        for name, (models, location_params) in profiles.items():
+            model = models[i]
+            mae, _, r2 = evaluate_model(model, X_test, y_test[:, i], f"{name}")
+            single_ms, batch_ms = measure_latency(serving_model_set([model], [column]), X_test)
+            results[column][name] = {
+                'params': location_params[i],
+                'mae': mae,
+                'r2': r2,
+                'validation_mae': mean_absolute_error(y_val[:, i], model.predict(X_val)),
+                'single_row_ms': single_ms,
+                'batch_ms': batch_ms,
+                'size_bytes': model_size(model),
+            }
+
+        full = results[column][FULL_PROFILE]
+        print(f"{'profil':<12}{'MAE':>8}{'R²':>7}{'1 red (ms)':>12}{'test (ms)':>11}{'veličina (MB)':>15}")
+        for name, result in results[column].items():
+            print(f"{name:<12}{result['mae']:>8.3f}{result['r2']:>7.3f}{result['single_row_ms']:>12.2f}"
+                  f"{result['batch_ms']:>11.1f}{result['size_bytes'] / 1e6:>15.2f}")
+        acceptable = [name for name, result in results[column].items()
+                      if result['validation_mae'] <= full['validation_mae'] * (1 + SERVING_MAE_TOLERANCE)]
+        recommended[column] = min(acceptable, key=lambda name: results[column][name]['size_bytes'])
+        best = results[column][recommended[column]]
+        print(f"Izabrani profil: {recommended[column]} {best['params']} "
+              f"(MAE {best['mae'] - full['mae']:+.3f}, {full['size_bytes'] / best['size_bytes']:.1f}x manji, "
+              f"1 red {full['single_row_ms'] / best['single_row_ms']:.1f}x brže)")
+
+    # Izabrani profili se čuvaju kao obična verzija (isti parametri za sve lokacije daju istu verziju kao train_model)
+    print("\n--- VERZIJA SA IZABRANIM PROFILIMA ---")
+    location_params = [results[column][recommended[column]]['params'] for column in TARGET_COLUMNS]
+    params = location_params[0] if all(p == location_params[0] for p in location_params) else location_params
+    _, metadata = train_and_save(filepath, artifacts_dir, params=params, memmap=memmap, workers=workers,
+                                 kind=PER_LOCATION, backend=RANDOM_FOREST, activate=activate)
+    version = metadata['version']
+
+    # Vreme predikcije sačuvane verzije tačno kao u aplikaciji (load_model_set), prema punim šumama
+    full_ms, _ = measure_latency(serving_model_set(full_models, TARGET_COLUMNS), X_test)
+    version_ms, _ = measure_latency(load_model_set(artifacts_dir, version), X_test)
+    print(f"Sve lokacije, 1 red: {FULL_PROFILE} {full_ms:.2f} ms | verzija {version} {version_ms:.2f} ms")
+    if not activate:
+        print(f"Aktivacija: POST /api/models/reload sa {{\"version\": \"{version}\"}}")
+    return results, recommended, version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poređenje profila za posluživanje (tačnost, vreme predikcije, veličina) i čuvanje izabranih kao verzije")
+    parser.add_argument('--data', default=DATA_PATH, help="Putanja do CSV skupa podataka")
+    parser.add_argument('--artifacts', default=ARTIFACTS_DIR, help="Direktorijum za čuvanje modela")
+    parser.add_argument('--no-memmap', dest='memmap', action='store_false', default=USE_MEMMAP, help="Trening preko DataFrame-a umesto memorijski mapiranih matrica")
+    parser.add_argument('--workers', type=int, default=TRAIN_WORKERS, help="Broj jezgara za treniranje (podrazumevano sva)")
+    parser.add_argument('--activate', action='store_true', help="Odmah pomera LATEST na sačuvanu verziju (aplikacija je preuzima)")
+    args = parser.parse_args()
+    build_serving_profiles(args.data, args.artifacts, args.memmap, args.workers, args.activate)
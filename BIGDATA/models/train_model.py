@@ -1,61 +1,361 @@
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from models.data_preprocessing import load_and_preprocess_data
+from models.data_preprocessing import load_and_preprocess_data, load_feature_matrix, features_to_matrix, sync_datetime_index, TARGET_COLUMNS, FEATURE_DTYPE
+from models.model_set import ModelSet, PER_LOCATION, MULTI_OUTPUT, export_flat_forest
+from models.flat_forest import fold_scaler_thresholds
+from models.model_store import compute_dataset_hash, compute_params_hash, find_version, save_models, load_models, load_metadata, set_latest_version
+from config import DATA_PATH, ARTIFACTS_DIR, MODEL_BACKEND, MODEL_PARAMS, HGB_PARAMS, PERMUTATION_IMPORTANCE_REPEATS, TEST_SIZE, SPLIT_RANDOM_STATE, USE_MEMMAP, TRAIN_WORKERS, USE_FLAT_FOREST, FOLD_SCALER
+from joblib import Parallel, delayed
+from threadpoolctl import threadpool_limits
+import argparse
+import copy
+import os
+import pickle
+import time
+import numpy as np
 import pandas as pd
 
-def create_model_pipeline():
+# Regresori (MODEL_BACKEND u config.py)
+RANDOM_FOREST = 'random_forest'
+HIST_GRADIENT_BOOSTING = 'hist_gradient_boosting'
+
+def default_params(backend=MODEL_BACKEND):
+    return HGB_PARAMS if backend == HIST_GRADIENT_BOOSTING else MODEL_PARAMS
+
+def create_model_pipeline(params=None, backend=MODEL_BACKEND):
+    params = default_params(backend) if params is None else params
+    if backend == HIST_GRADIENT_BOOSTING:
+        # Ulazne vrednosti se jednom dele u binove po kvantilima, pa skaliranje ne utiče na model
+        return Pipeline([('regressor', HistGradientBoostingRegressor(**params))])
+    if backend != RANDOM_FOREST:
+        raise ValueError(f"Nepoznat regresor: '{backend}'.")
     return Pipeline([
         ('scaler', StandardScaler()), # Normalizuje podatke kako bi imali standardnu distribuciju (srednja vrednost 0 i standardna devijacija 1)
-        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))  # RandomForestRegressor se koristi za predikciju
+        ('regressor', RandomForestRegressor(**params))  # RandomForestRegressor se koristi za predikciju
     ])
 
+def fold_scaler(model):
+    """
+    Ugrađuje StandardScaler istreniranog Pipeline-a u pragove stabala i vraća Pipeline bez skaliranja.
+    Stablo poredi samo redosled vrednosti, pa su za float32 ulaz predikcije identične kao sa skaliranjem,
+    a predikcija više ne pravi skaliranu kopiju ulaza.
+    """
+    scaler, forest = model.named_steps['scaler'], model.named_steps['regressor']
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        split = tree.children_left >= 0
+        features = tree.feature[split]
+        # tree.threshold je pogled u čvorove stabla, pa se pragovi menjaju u mestu
+        tree.threshold[split] = fold_scaler_thresholds(tree.threshold[split], scaler.mean_[features], scaler.scale_[features])
+    return Pipeline([('regressor', forest)])
+
 # Funkcija za evaluaciju pojedinačnih modela
 #MAE (Mean Absolute Error) – kolika je u prosjeku greška
 #MSE (Mean Squared Error) – kazna za velike greške
 #R² (R-squared) – koliko dobro model objašnjava podatke (bliže 1 = bolje)
 def evaluate_model(model, X_test, y_test, label):
     predictions = model.predict(X_test)  # Generisanje predikcija na osnovu test podataka
+    return evaluate_predictions(predictions, y_test, label)
+
+def evaluate_predictions(predictions, y_test, label):
     mae = mean_absolute_error(y_test, predictions)  # Prosečna apsolutna greška
     mse = mean_squared_error(y_test, predictions)  # Srednja kvadratna greška
     r2 = r2_score(y_test, predictions)  # Koeficijent determinacije (R²)
     print(f"{label}: MAE={mae:.2f}, MSE={mse:.2f}, R²={r2:.2f}")  # Štampanje metrika za evaluaciju modela
     return mae, mse, r2  # Vraćanje vrednosti metrika
 
+def model_size(model):
+    """
+    Veličina modela u bajtovima (serijalizovan kao pri čuvanju verzije).
+    """
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+def compute_importances(models, X_test, y_test, kind=PER_LOCATION):
+    """
+    Važnost ulaznih parametara za modele bez feature_importances_ (npr. HGB): permutaciona važnost
+    na test skupu (pad R² kada se vrednosti parametra izmešaju), negativne vrednosti se postavljaju na 0.
+    Vraća listu po lokacijama (redosled kao TARGET_COLUMNS), ili None ako modeli imaju svoju važnost.
+    """
+    if all(hasattr(model.named_steps['regressor'], 'feature_importances_') for model in models):
+        return None
+    targets = [y_test] if kind == MULTI_OUTPUT else [y_test[:, i] for i in range(y_test.shape[1])]
+    return [
+        np.maximum(permutation_importance(model, X_test, y, n_repeats=PERMUTATION_IMPORTANCE_REPEATS,
+                                          random_state=SPLIT_RANDOM_STATE).importances_mean, 0).tolist()
+        for model, y in zip(models, targets)
+    ]
+
 # Funkcija za evaluaciju ukupne proizvodnje (sabiranjem predikcija)
-def evaluate_total_production(models, X_test, y_test_total, label):
-    pred_1 = models[0].predict(X_test)  # Predikcije za Lokaciju 1
-    pred_2 = models[1].predict(X_test)  # Predikcije za Lokaciju 2
-    pred_3 = models[2].predict(X_test)  # Predikcije za Lokaciju 3
-    total_pred_sum = pred_1 + pred_2 + pred_3  # Sabiranje predikcija za sve lokacije
+def evaluate_total_production(model_set, X_test, y_test_total, label):
+    total_pred_sum = model_set.predict(X_test).sum(axis=1)  # Sabiranje predikcija za sve lokacije
     mae = mean_absolute_error(y_test_total, total_pred_sum)  # Prosečna apsolutna greška za ukupnu proizvodnju
     mse = mean_squared_error(y_test_total, total_pred_sum)  # Srednja kvadratna greška za ukupnu proizvodnju
     r2 = r2_score(y_test_total, total_pred_sum)  # R² za ukupnu proizvodnju
     print(f"{label}: MAE={mae:.2f}, MSE={mse:.2f}, R²={r2:.2f}")  # Štampanje rezultata evaluacije
     return mae, mse, r2
 
+# Funkcija za evaluaciju svih lokacija i ukupne proizvodnje
+def evaluate_model_set(model_set, X_test, y_test):
+    predictions = model_set.predict(X_test)
+    metrics = {}
+    for i, column in enumerate(model_set.targets):
+        metrics[column] = evaluate_predictions(predictions[:, i], y_test[:, i], f"Satni model - Lokacija {i+1}")
+
+    # Evaluacija za ukupnu proizvodnju (sabiranjem)
+    metrics['Total'] = evaluate_total_production(model_set, X_test, y_test.sum(axis=1), "Satna ukupna proizvodnja")
+    return metrics
+
+# Merenje vremena predikcije: jedan red (kao u aplikaciji) i ceo test skup odjednom
+def measure_latency(model_set, X_test, repeats=30):
+    single_row = X_test[:1]
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model_set.predict(single_row)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model_set.predict(X_test)
+    batch = time.perf_counter() - start
+    return float(np.median(timings)) * 1000, batch * 1000  # Milisekunde
+
+def training_params(params=None, memmap=USE_MEMMAP, kind=PER_LOCATION, fold=FOLD_SCALER, backend=MODEL_BACKEND):
+    """
+    Svi parametri koji utiču na rezultat treniranja (ulaze u heš verzije).
+    """
+    return {
+        'backend': backend,
+        'model': default_params(backend) if params is None else params,
+        'kind': kind,
+        'test_size': TEST_SIZE,
+        'split_random_state': SPLIT_RANDOM_STATE,
+        'feature_dtype': np.dtype(FEATURE_DTYPE).name,
+        'memmap': memmap,
+        'deduplicate': True,  # Ponovljena vremena: trenira se samo na poslednjem upisanom redu
+        'fold_scaler': fold,
+    }
+
+def load_training_data(filepath, memmap=USE_MEMMAP):
+    """
+    Vraća (X_train, X_test, y_train, y_test) kao NumPy matrice (kolone ciljeva su redom TARGET_COLUMNS).
+    - memmap=True: pogledi u memorijski mapirane matrice, bez dodatnih kopija u memoriji.
+    - memmap=False: klasičan put preko DataFrame-a i train_test_split (isti raspored redova).
+    """
+    if memmap:
+        X, y, n_train = load_feature_matrix(filepath, TEST_SIZE, SPLIT_RANDOM_STATE)
+        return X[:n_train], X[n_train:], y[:n_train], y[n_train:]
+
+    X, y = load_and_preprocess_data(filepath)  # Učitavanje i priprema podataka iz CSV fajla
+    X_train, X_test, y_train, y_test = train_test_split(X, pd.DataFrame(y), test_size=TEST_SIZE, random_state=SPLIT_RANDOM_STATE)  # Podela podataka na trening i test skupove
+    return features_to_matrix(X_train), features_to_matrix(X_test), y_train[TARGET_COLUMNS].to_numpy(), y_test[TARGET_COLUMNS].to_numpy()
+
+def split_workers(workers, n_models):
+    """
+    Deli budžet jezgara: broj paralelnih procesa (najviše jedan po modelu) i broj niti po šumi.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else max(1, workers)
+    processes = min(workers, n_models)
+    return processes, max(1, workers // processes)
+
+def fit_location_model(params, X_train, y_train, n_jobs=None, fold=FOLD_SCALER, backend=MODEL_BACKEND):
+    """
+    Trenira model jedne lokacije; šuma gradi stabla u n_jobs niti (HGB koristi najviše n_jobs OpenMP niti).
+    fold=True: skaliranje se posle treniranja ugrađuje u pragove (fold_scaler).
+    """
+    model = create_model_pipeline(params, backend)
+    if backend == HIST_GRADIENT_BOOSTING:
+        with threadpool_limits(limits=n_jobs, user_api='openmp'):
+            return model.fit(X_train, y_train)
+    model.set_params(regressor__n_jobs=n_jobs)
+    model.fit(X_train, y_train)
+    # Za predikciju jednog reda paralelizacija samo dodaje režiju, pa se sačuvani model vraća na jednu nit
+    model.set_params(regressor__n_jobs=None)
+    return fold_scaler(model) if fold else model
+
+def fit_models(kind, params, X_train, y_train, workers=TRAIN_WORKERS, fold=FOLD_SCALER, backend=MODEL_BACKEND):
+    """
+    Trenira modele zadate vrste i vraća listu modela za ModelSet.
+    Za modele po lokacijama params može biti i lista (po jedan rečnik za svaku lokaciju, npr. profil za posluživanje).
+    """
+    if kind == MULTI_OUTPUT and backend == HIST_GRADIENT_BOOSTING:
+        raise ValueError("HistGradientBoostingRegressor nema više izlaza - koristite modele po lokacijama.")
+    if isinstance(params, list) and (kind == MULTI_OUTPUT or len(params) != y_train.shape[1]):
+        raise ValueError("Parametri po lokacijama traže modele po lokacijama i po jedan rečnik za svaku lokaciju.")
+    if kind == MULTI_OUTPUT:
+        # Jedna šuma sa više izlaza - sva jezgra idu na paralelno građenje stabala
+        _, tree_jobs = split_workers(workers, 1)
+        print(f"Treniranje: 1 model sa više izlaza x {tree_jobs} niti")
+        return [fit_location_model(params, X_train, np.ascontiguousarray(y_train), tree_jobs, fold, backend)]
+
+    # Kreiranje i treniranje modela za svaku lokaciju, skicit-learn
+    # (memorijski mapirane matrice se procesima prosleđuju kao reference na fajl, bez kopiranja)
+    processes, tree_jobs = split_workers(workers, y_train.shape[1])
+    location_params = params if isinstance(params, list) else [params] * y_train.shape[1]
+    print(f"Treniranje: {processes} paralelnih procesa x {tree_jobs} niti po šumi")
+    return Parallel(n_jobs=processes)(
+        delayed(fit_location_model)(location_params[i], X_train, y_train[:, i], tree_jobs, fold, backend) for i in range(y_train.shape[1])
+    )
+
 # SATNI MODELI
-X, y = load_and_preprocess_data('dataset/Data_Cacak.csv')  # Učitavanje i priprema podataka iz CSV fajla
-X_train, X_test, y_train, y_test = train_test_split(X, pd.DataFrame(y), test_size=0.2, random_state=42)  # Podela podataka na trening i test skupove
-
-# Kreiranje i treniranje modela za svaku lokaciju, skicit-learn
-model_location_1 = create_model_pipeline()
-model_location_2 = create_model_pipeline()
-model_location_3 = create_model_pipeline()
-
-model_location_1.fit(X_train, y_train['Production - Location 1'])  # Treniranje modela za Lokaciju 1
-model_location_2.fit(X_train, y_train['Production - Location 2'])  # Treniranje modela za Lokaciju 2
-model_location_3.fit(X_train, y_train['Production - Location 3'])  # Treniranje modela za Lokaciju 3
-
-#Evaulacija
-print("\n--- SATNI MODELI ---")
-evaluate_model(model_location_1, X_test, y_test['Production - Location 1'], "Satni model - Lokacija 1")  # Evaluacija za Lokaciju 1
-evaluate_model(model_location_2, X_test, y_test['Production - Location 2'], "Satni model - Lokacija 2")  # Evaluacija za Lokaciju 2
-evaluate_model(model_location_3, X_test, y_test['Production - Location 3'], "Satni model - Lokacija 3")  # Evaluacija za Lokaciju 3
-
-# Evaluacija za ukupnu proizvodnju (sabiranjem)
-evaluate_total_production(
-    [model_location_1, model_location_2, model_location_3], X_test, y_test.sum(axis=1), "Satna ukupna proizvodnja"
-)
+def train_models(filepath=DATA_PATH, params=None, memmap=USE_MEMMAP, workers=TRAIN_WORKERS, kind=PER_LOCATION, fold=FOLD_SCALER, backend=MODEL_BACKEND):
+    """
+    Trenira modele za sve lokacije (po jedan za svaku lokaciju paralelno, ili jedan sa više izlaza)
+    i štampa evaluaciju. Vraća listu modela (za ModelSet), metrike i permutacionu važnost parametara
+    (None za šume, koje imaju svoju).
+    """
+    X_train, X_test, y_train, y_test = load_training_data(filepath, memmap)
+    duplicates = sync_datetime_index(filepath).duplicate_count()
+    if duplicates:
+        print(f"Ponovljena vremena: {duplicates} starijih redova zamenjeno kasnijim upisom (nisu u treningu).")
+    models = fit_models(kind, params, X_train, y_train, workers, fold, backend)
+
+    #Evaulacija
+    print("\n--- SATNI MODELI ---")
+    metrics = evaluate_model_set(ModelSet(models, {'kind': kind}), X_test, y_test)
+    return models, metrics, compute_importances(models, X_test, y_test, kind)
+
+def compare_model_kinds(filepath=DATA_PATH, params=None, memmap=USE_MEMMAP, workers=TRAIN_WORKERS):
+    """
+    Poredi modele po lokacijama sa jednim modelom sa više izlaza: tačnost i vreme predikcije.
+    """
+    X_train, X_test, y_train, y_test = load_training_data(filepath, memmap)
+    results = {}
+    for kind, label in [(PER_LOCATION, "Modeli po lokacijama"), (MULTI_OUTPUT, "Jedan model sa više izlaza")]:
+        print(f"\n--- {label.upper()} ---")
+        model_set = ModelSet(fit_models(kind, params, X_train, y_train, workers, backend=RANDOM_FOREST), {'kind': kind})
+        metrics = evaluate_model_set(model_set, X_test, y_test)
+        results[label] = (metrics['Total'], measure_latency(model_set, X_test))
+
+    print("\n--- POREĐENJE ---")
+    for label, ((mae, _, r2), (single_ms, batch_ms)) in results.items():
+        print(f"{label}: ukupno MAE={mae:.2f}, R²={r2:.2f} | 1 red: {single_ms:.2f} ms | {len(X_test)} redova: {batch_ms:.1f} ms")
+    return results
+
+def compare_backends(filepath=DATA_PATH, memmap=USE_MEMMAP, workers=TRAIN_WORKERS):
+    """
+    Poredi šumu (RandomForestRegressor) i HistGradientBoostingRegressor: tačnost, vreme treniranja,
+    vreme predikcije i veličinu modela.
+    """
+    X_train, X_test, y_train, y_test = load_training_data(filepath, memmap)
+    results = {}
+    for backend, label in [(RANDOM_FOREST, "RandomForestRegressor"), (HIST_GRADIENT_BOOSTING, "HistGradientBoostingRegressor")]:
+        print(f"\n--- {label.upper()} ---")
+        start = time.perf_counter()
+        models = fit_models(PER_LOCATION, default_params(backend), X_train, y_train, workers, backend=backend)
+        fit_seconds = time.perf_counter() - start
+        model_set = ModelSet(models, {'kind': PER_LOCATION})
+        metrics = evaluate_model_set(model_set, X_test, y_test)
+        size_bytes = sum(model_size(model) for model in models)
+        results[label] = (metrics['Total'], fit_seconds, measure_latency(model_set, X_test), size_bytes)
+
+    print("\n--- POREĐENJE REGRESORA ---")
+    for label, ((mae, _, r2), fit_seconds, (single_ms, batch_ms), size_bytes) in results.items():
+        print(f"{label}: ukupno MAE={mae:.2f}, R²={r2:.2f} | treniranje: {fit_seconds:.1f} s | 1 red: {single_ms:.2f} ms"
+              f" | {len(X_test)} redova: {batch_ms:.1f} ms | veličina: {size_bytes / 1e6:.2f} MB")
+    return results
+
+def benchmark_scaler_folding(filepath=DATA_PATH, params=None, memmap=USE_MEMMAP, workers=TRAIN_WORKERS):
+    """
+    Poredi modele sa StandardScaler-om i iste modele sa skaliranjem ugrađenim u pragove:
+    najveća razlika predikcija i vreme skaliranja pri treniranju i predikciji.
+    """
+    X_train, X_test, y_train, y_test = load_training_data(filepath, memmap)
+    models = fit_models(PER_LOCATION, params, X_train, y_train, workers, fold=False, backend=RANDOM_FOREST)
+    start = time.perf_counter()
+    folded = [fold_scaler(copy.deepcopy(model)) for model in models]
+    fold_seconds = time.perf_counter() - start
+
+    # Vreme koje skaliranje dodaje treniranju (fit_transform trening skupa, za svaki model)
+    start = time.perf_counter()
+    StandardScaler().fit_transform(X_train)
+    scaler_fit_ms = (time.perf_counter() - start) * 1000 * len(models)
+
+    with_scaler, without_scaler = ModelSet(models, {}), ModelSet(folded, {})
+    difference = np.abs(with_scaler.predict(X_test) - without_scaler.predict(X_test)).max()
+    print("\n--- UGRAĐIVANJE SKALIRANJA U PRAGOVE ---")
+    print(f"Najveća razlika predikcija na {len(X_test)} redova: {difference:.3g}")
+    print(f"Ugrađivanje: {fold_seconds:.2f} s | skaliranje pri treniranju: {scaler_fit_ms:.1f} ms")
+    results = {}
+    for label, model_set in [("Sa StandardScaler-om", with_scaler), ("Ugrađeno u pragove", without_scaler)]:
+        results[label] = measure_latency(model_set, X_test)
+        single_ms, batch_ms = results[label]
+        print(f"{label}: 1 red: {single_ms:.2f} ms | {len(X_test)} redova: {batch_ms:.1f} ms")
+    return difference, results
+
+def train_and_save(filepath=DATA_PATH, artifacts_dir=ARTIFACTS_DIR, params=None, force=False, memmap=USE_MEMMAP, workers=TRAIN_WORKERS, kind=PER_LOCATION, fold=FOLD_SCALER, backend=MODEL_BACKEND, activate=True):
+    """
+    Trenira modele i čuva ih kao novu verziju artefakata.
+    Ako verzija za iste podatke i iste hiperparametre već postoji, trening se preskače (osim uz force=True).
+    activate=False: verzija se samo čuva, LATEST ostaje isti (aktivira se kasnije, npr. /api/models/reload).
+    """
+    dataset_hash = compute_dataset_hash(filepath)
+    params_hash = compute_params_hash(training_params(params, memmap, kind, fold, backend))
+
+    existing_version = None if force else find_version(artifacts_dir, dataset_hash, params_hash)
+    if existing_version is not None:
+        print(f"Modeli za ove podatke i parametre već postoje (verzija {existing_version}), trening se preskače.")
+        if activate:
+            set_latest_version(artifacts_dir, existing_version)
+        return load_models(artifacts_dir, existing_version)
+
+    models, metrics, importances = train_models(filepath, params, memmap, workers, kind, fold, backend)
+    metadata = {
+        'dataset_path': filepath,
+        'dataset_hash': dataset_hash,
+        'params': training_params(params, memmap, kind, fold, backend),
+        'params_hash': params_hash,
+        'targets': TARGET_COLUMNS,
+        'kind': kind,
+        'metrics': {label: dict(zip(['mae', 'mse', 'r2'], values)) for label, values in metrics.items()},
+    }
+    if importances is not None:
+        metadata['feature_importances'] = importances
+    # Ravan zapis šuma (za brzu predikciju jednog reda) se izvozi pre pomeranja LATEST pokazivača
+    finalize = (lambda version: export_flat_forest(models, artifacts_dir, version)) if USE_FLAT_FOREST else None
+    version = save_models(models, metadata, artifacts_dir, finalize, activate)
+    print(f"Modeli sačuvani kao verzija {version}")
+    return models, load_metadata(artifacts_dir, version)
+
+def retrain_version(metadata, filepath=DATA_PATH, artifacts_dir=ARTIFACTS_DIR, workers=TRAIN_WORKERS):
+    """
+    Ponovo trenira modele sa istim podešavanjima kao zadata verzija (vrsta, regresor, ugrađeno skaliranje,
+    hiperparametri, i kada su zadati po lokacijama, memmap); podešavanja koja starija verzija nije zapisala uzimaju se iz config.py.
+    Vraća oznaku nove verzije (ili postojeće, ako su podaci i podešavanja isti).
+    """
+    params = metadata.get('params', {})
+    _, new_metadata = train_and_save(
+        filepath, artifacts_dir, params=params.get('model'), memmap=params.get('memmap', USE_MEMMAP), workers=workers,
+        kind=params.get('kind', metadata.get('kind', PER_LOCATION)), fold=params.get('fold_scaler', FOLD_SCALER),
+        backend=params.get('backend', MODEL_BACKEND),
+    )
+    return new_metadata['version']
+
+# Komanda za treniranje: python -m models.train_model (pokreće se iz BIGDATA direktorijuma)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Treniranje modela za predikciju solarne proizvodnje")
+    parser.add_argument('--data', default=DATA_PATH, help="Putanja do CSV skupa podataka")
+    parser.add_argument('--artifacts', default=ARTIFACTS_DIR, help="Direktorijum za čuvanje modela")
+    parser.add_argument('--force', action='store_true', help="Ponovo trenira i kada verzija za iste podatke već postoji")
+    parser.add_argument('--no-memmap', dest='memmap', action='store_false', default=USE_MEMMAP, help="Trening preko DataFrame-a umesto memorijski mapiranih matrica")
+    parser.add_argument('--workers', type=int, default=TRAIN_WORKERS, help="Broj jezgara za treniranje (podrazumevano sva)")
+    parser.add_argument('--multi-output', action='store_true', help="Jedan model sa više izlaza umesto po jednog modela za svaku lokaciju")
+    parser.add_argument('--compare', action='store_true', help="Samo poredi modele po lokacijama i model sa više izlaza (bez čuvanja)")
+    parser.add_argument('--no-fold-scaler', dest='fold', action='store_false', default=FOLD_SCALER, help="Čuva StandardScaler u modelu umesto da ga ugradi u pragove stabala")
+    parser.add_argument('--backend', choices=[RANDOM_FOREST, HIST_GRADIENT_BOOSTING], default=MODEL_BACKEND, help="Regresor (podrazumevano MODEL_BACKEND iz config.py)")
+    parser.add_argument('--compare-backends', action='store_true', help="Samo poredi šumu i HistGradientBoostingRegressor (bez čuvanja)")
+    parser.add_argument('--benchmark-fold', action='store_true', help="Samo poredi predikcije i vreme sa i bez ugrađenog skaliranja (bez čuvanja)")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_model_kinds(args.data, memmap=args.memmap, workers=args.workers)
+    elif args.compare_backends:
+        compare_backends(args.data, memmap=args.memmap, workers=args.workers)
+    elif args.benchmark_fold:
+        benchmark_scaler_folding(args.data, memmap=args.memmap, workers=args.workers)
+    else:
+        kind = MULTI_OUTPUT if args.multi_output else PER_LOCATION
+        train_and_save(args.data, args.artifacts, force=args.force, memmap=args.memmap, workers=args.workers, kind=kind, fold=args.fold, backend=args.backend)
@@ -0,0 +1,75 @@
+import numpy as np
+from models.data_preprocessing import DATETIME_COLUMN, FEATURE_COLUMNS, TARGET_COLUMNS
+
+"""
+Validacija mjerenja pre upisa u skup podataka (forma /add i grupni unos).
+- Pravila se primenjuju kao NumPy maske nad celim kolonama, pa je cena ista za jedan i za 100k redova.
+- Izveštaj o greškama se pravi samo za nevalidne redove (i najviše za zadati broj redova).
+Očekuju se podaci sa već konvertovanim tipovima (convert_column_types): nevalidne vrednosti su NaN/NaT.
+"""
+
+# Granice vrednosti: (najmanja, najveća, poruka). Ostale numeričke kolone moraju biti nenegativne.
+VALUE_BOUNDS = {
+    'AirTemperature': (-50, 50, "Temperatura mora biti između -50 i 50 stepeni."),
+    'CloudOpacity': (0, 100, "Oblačnost mora biti između 0% i 100%."),
+}
+NON_NEGATIVE_MESSAGE = "Sve vrednosti moraju biti pozitivni brojevi ili nula."
+MISSING_DATETIME_MESSAGE = "Datum i vreme nedostaju ili nisu u ispravnom formatu."
+MISSING_VALUE_MESSAGE = "Vrednost nedostaje ili nije broj."
+
+
+def validation_masks(data):
+    """
+    Vraća listu (kolona, poruka, maska nevalidnih redova) - po jedno pravilo za svaku kolonu i vrstu greške.
+    """
+    masks = [(DATETIME_COLUMN, MISSING_DATETIME_MESSAGE, np.isnat(data[DATETIME_COLUMN].to_numpy()))]
+    for column in FEATURE_COLUMNS + TARGET_COLUMNS:
+        values = data[column].to_numpy()
+        low, high, message = VALUE_BOUNDS.get(column, (0, np.inf, NON_NEGATIVE_MESSAGE))
+        missing = ~np.isfinite(values)
+        with np.errstate(invalid='ignore'):
+            out_of_bounds = (values < low) | (values > high)
+        masks.append((column, MISSING_VALUE_MESSAGE, missing))
+        masks.append((column, message, out_of_bounds))
+    return masks
+
+
+def error_report(masks, rows, row_offset=0):
+    """
+    Greške za zadate (nevalidne) redove: [{'row': broj reda od 1, 'errors': [{'column', 'message'}]}].
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    errors = [{'column': column, 'message': message} for column, message, _ in masks]
+    failed = np.zeros((len(rows), len(masks)), dtype=bool)
+    for k, (_, _, mask) in enumerate(masks):
+        failed[:, k] = mask[rows]
+
+    # Parovi (red, pravilo) su poređani po redovima, pa se greške jednog reda nalaze u jednom odsečku
+    row_index, rule_index = np.nonzero(failed)
+    bounds = np.searchsorted(row_index, np.arange(len(rows) + 1)).tolist()
+    rule_index = rule_index.tolist()
+    return [
+        {'row': row + row_offset + 1, 'errors': [errors[k] for k in rule_index[bounds[i]:bounds[i + 1]]]}
+        for i, row in enumerate(rows.tolist())
+    ]
+
+
+def validate_measurements(data, max_reported_rows=None, row_offset=0):
+    """
+    Validira sve redove odjednom. Vraća (maska nevalidnih redova, izveštaj o greškama za prvih
+    max_reported_rows nevalidnih redova; None = za sve). Brojevi redova u izveštaju počinju od row_offset + 1.
+    """
+    masks = validation_masks(data)
+    invalid = np.logical_or.reduce([mask for _, _, mask in masks])
+    rows = np.flatnonzero(invalid)
+    if max_reported_rows is not None:
+        rows = rows[:max_reported_rows]
+    return invalid, error_report(masks, rows, row_offset)
+
+
+def error_messages(report):
+    """
+    Jedinstvene poruke iz izveštaja, redom (za prikaz korisniku u formi).
+    """
+    messages = [error['message'] for row in report for error in row['errors']]
+    return list(dict.fromkeys(messages))
@@ -0,0 +1,162 @@
+/*
+ * Klijentsko iscrtavanje dashboard-a.
+ * - Predikcija za poslednje mjerenje dolazi kao sirovi brojevi sa /api/predictions/latest.
+ * - Važnost parametara se dohvata jednom po verziji modela (/api/importances?version=...),
+ *   pa je pregledač kešira.
+ * - Grafovi se prave ovde, po uzoru na generate_chart i generate_feature_importance_chart iz main.py.
+ */
+(function () {
+    'use strict';
+
+    var LOCATION_LABELS = ['Lokacija 1', 'Lokacija 2', 'Lokacija 3'];
+    var LOCATION_KEYS = ['location_1', 'location_2', 'location_3'];
+    var importancesByVersion = {};
+
+    // Bar graf predikcija po lokacijama, ukupna proizvodnja i linija prosečne predikcije
+    function predictionFigure(predictions, total, label) {
+        var percentages = predictions.map(function (pred) { return total > 0 ? (pred / total) * 100 : 0; });
+        var average = predictions.reduce(function (a, b) { return a + b; }, 0) / predictions.length;
+
+        var data = [
+            {
+                type: 'bar',
+                x: LOCATION_LABELS,
+                y: predictions,
+                text: predictions.map(function (pred, i) { return pred.toFixed(2) + ' kWh<br>(' + percentages[i].toFixed(2) + '%)'; }),
+                textposition: 'outside',
+                marker: { color: ['#3498db', '#2ecc71', '#e74c3c'] },
+                name: 'Predikcija po lokacijama'
+            },
+            {
+                type: 'bar',
+                x: ['Ukupno'],
+                y: [total],
+                text: total.toFixed(2) + ' kWh',
+                textposition: 'outside',
+                marker: { color: 'red' },
+                name: label
+            },
+            {
+                type: 'scatter',
+                x: LOCATION_LABELS,
+                y: [average, average, average],
+                mode: 'lines+text',
+                name: 'Prosečna proizvodnja',
+                line: { color: 'orange', dash: 'dash' },
+                text: ['Prosek: ' + average.toFixed(2) + ' kWh'],
+                textposition: 'top center'
+            }
+        ];
+        var layout = {
+            title: { text: 'Predikcija solarne energije' },
+            xaxis: { title: { text: 'Kategorija' }, tickangle: 0 },
+            yaxis: { title: { text: 'Proizvodnja (kWh)' }, ticksuffix: ' kWh', range: [0, Math.max.apply(null, predictions.concat([total])) * 1.2] },
+            barmode: 'group',
+            legend: { title: { text: 'Legenda' }, orientation: 'h', y: -0.2, x: 0.5, xanchor: 'center', font: { size: 10 } }
+        };
+        return { data: data, layout: layout };
+    }
+
+    // Sortirani procenti važnosti parametara sa linijom prosečne važnosti
+    function importanceFigure(importances, featureNames, title) {
+        var sum = importances.reduce(function (a, b) { return a + b; }, 0);
+        var items = importances.map(function (value, i) { return { name: featureNames[i], value: (value / sum) * 100 }; });
+        items.sort(function (a, b) { return b.value - a.value; });
+
+        var names = items.map(function (item) { return item.name; });
+        var values = items.map(function (item) { return item.value; });
+        var average = values.reduce(function (a, b) { return a + b; }, 0) / values.length;
+
+        var data = [{
+            type: 'bar',
+            x: names,
+            y: values,
+            marker: { color: values.map(function (val) { return val > 20 ? '#2ecc71' : val > 10 ? '#3498db' : '#e74c3c'; }) },
+            text: values.map(function (val) { return val.toFixed(2) + '%'; }),
+            textposition: 'outside',
+            hovertext: items.map(function (item) { return 'Parametar: ' + item.name + '<br>Važnost: ' + item.value.toFixed(2) + '%'; }),
+            hoverinfo: 'text'
+        }];
+        var layout = {
+            title: { text: title },
+            xaxis: { title: { text: 'Parametri (sortirani)' }, tickangle: 45 },
+            yaxis: { title: { text: 'Važnost parametara (%)' }, ticksuffix: '%', range: [0, Math.max.apply(null, values) * 1.2] },
+            shapes: [{ type: 'line', xref: 'paper', x0: 0, x1: 1, y0: average, y1: average, line: { color: 'black', dash: 'dash' } }],
+            annotations: [{ text: 'Prosečna važnost', xref: 'paper', x: 0, y: average, xanchor: 'left', yanchor: 'bottom', showarrow: false }]
+        };
+        return { data: data, layout: layout };
+    }
+
+    function fetchJson(url) {
+        return fetch(url, { headers: { 'Accept': 'application/json' } }).then(function (response) {
+            return response.json().then(function (body) {
+                if (!response.ok) {
+                    throw new Error(body.error || ('HTTP ' + response.status));
+                }
+                return body;
+            });
+        });
+    }
+
+    function loadImportances(dashboard, version) {
+        if (!importancesByVersion[version]) {
+            var url = dashboard.dataset.importancesUrl + '?version=' + encodeURIComponent(version);
+            importancesByVersion[version] = fetchJson(url);
+        }
+        return importancesByVersion[version];
+    }
+
+    function renderPrediction(dashboard, latest) {
+        var predictions = LOCATION_KEYS.map(function (key) { return latest.predictions[key]; });
+        var total = latest.predictions.total_production;
+
+        LOCATION_KEYS.concat(['total_production']).forEach(function (key) {
+            dashboard.querySelector('[data-result="' + key + '"]').textContent = latest.predictions[key];
+        });
+        var figure = predictionFigure(predictions, total, 'Ukupno - satna predikcija');
+        Plotly.react('prediction-chart', figure.data, figure.layout);
+    }
+
+    function renderImportances(importances) {
+        var charts = importances.locations.map(function (values, i) {
+            return { values: values, title: 'Uticaj parametara - Lokacija ' + (i + 1) };
+        });
+        charts.push({ values: importances.average, title: 'Uticaj parametara - Ukupna proizvodnja' });
+
+        charts.forEach(function (chart, i) {
+            var figure = importanceFigure(chart.values, importances.features, chart.title);
+            Plotly.react('importance-chart-' + i, figure.data, figure.layout);
+        });
+    }
+
+    function loadDashboard(dashboard) {
+        var error = document.getElementById('client-error');
+        return fetchJson(dashboard.dataset.latestUrl)
+            .then(function (latest) {
+                dashboard.classList.remove('d-none');
+                error.classList.add('d-none');
+                var serverDashboard = document.getElementById('server-dashboard');
+                if (serverDashboard) {
+                    serverDashboard.classList.add('d-none');
+                }
+                renderPrediction(dashboard, latest);
+                return loadImportances(dashboard, latest.model_version).then(renderImportances);
+            })
+            .catch(function (e) {
+                error.textContent = 'Greška: ' + e.message;
+                error.classList.remove('d-none');
+            });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var dashboard = document.getElementById('client-dashboard');
+        var form = document.getElementById('predict-form');
+        if (!dashboard || !form || !window.fetch) {
+            return;  // Bez JavaScript podrške forma šalje POST i server iscrtava stranicu
+        }
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            loadDashboard(dashboard);
+        });
+    });
+})();
@@ -0,0 +1,22 @@
+import numpy as np
+from models.datetime_index import DatetimeIndex
+
+# Indeks nad vremenima redom upisa: ponovljeno vreme je ispravka, važi poslednji upisani red.
+WRITTEN = np.array(['2024-01-01T02:00', '2024-01-01T00:00', '2024-01-01T01:00', '2024-01-01T00:00', '2024-01-01T02:00',
+                    '2024-01-01T02:00'], dtype='datetime64[m]')
+
+
+def make_index(times=WRITTEN):
+    order = np.argsort(times, kind='stable')
+    return DatetimeIndex(times[order], order)
+
+
+def test_duplicate_count():
+    assert make_index().duplicate_count() == 3
+    assert make_index(np.unique(WRITTEN)).duplicate_count() == 0
+    assert make_index(WRITTEN[:0]).duplicate_count() == 0
+
+
+def test_latest_rows_keep_last_write():
+    assert make_index().latest_rows().tolist() == [2, 3, 5]
+    assert make_index().lookup(np.datetime64('2024-01-01T02:00')).tolist() == [0, 4, 5]
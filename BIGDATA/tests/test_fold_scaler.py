@@ -0,0 +1,57 @@
+import copy
+import numpy as np
+import pytest
+from models.flat_forest import FlatForest
+from models.train_model import fit_location_model, fold_scaler, RANDOM_FOREST
+
+# Mala šuma nad sintetičkim float32 podacima: ugrađeno skaliranje i ravan zapis šuma moraju dati
+# bit-identične predikcije kao Pipeline sa StandardScaler-om, i za ulaze tačno na pragovima.
+PARAMS = {'n_estimators': 8, 'max_depth': 6, 'random_state': 0}
+
+
+def make_data(n_rows=400, n_features=4, seed=0):
+    rng = np.random.default_rng(seed)
+    # Različiti redovi veličine po parametru, da skaliranje zaista menja vrednosti
+    X = (rng.normal(size=(n_rows, n_features)) * [1, 50, 1e-3, 1e4] + [0, 200, 0, -5e3]).astype(np.float32)
+    y = X[:, 0] * 3 + np.sin(X[:, 1] / 50) + X[:, 2] * 1e3 + rng.normal(scale=0.1, size=n_rows)
+    return X, y
+
+
+def threshold_rows(folded, X):
+    # Za svaki čvor podele: red sa vrednošću parametra tačno na pragu i na susednim float32 vrednostima
+    rows = []
+    for estimator in folded.named_steps['regressor'].estimators_:
+        tree = estimator.tree_
+        for node in np.flatnonzero(tree.children_left >= 0):
+            feature, threshold = tree.feature[node], np.float32(tree.threshold[node])
+            for value in (threshold, np.nextafter(threshold, np.float32(-np.inf)), np.nextafter(threshold, np.float32(np.inf))):
+                row = X[node % len(X)].copy()
+                row[feature] = value
+                rows.append(row)
+    return np.array(rows, dtype=np.float32)
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    X, y = make_data()
+    model = fit_location_model(PARAMS, X, y, fold=False, backend=RANDOM_FOREST)
+    folded = fold_scaler(copy.deepcopy(model))
+    X_eval = np.concatenate([X, make_data(seed=1)[0], threshold_rows(folded, X)])
+    return model, folded, X_eval
+
+
+def test_fold_scaler_removes_scaler(fitted):
+    _, folded, _ = fitted
+    assert list(folded.named_steps) == ['regressor']
+
+
+def test_fold_scaler_predictions_bit_identical(fitted):
+    model, folded, X_eval = fitted
+    assert np.array_equal(folded.predict(X_eval), model.predict(X_eval))
+
+
+@pytest.mark.parametrize('use_folded', [False, True])
+def test_flat_forest_predictions_bit_identical(fitted, use_folded):
+    model, folded, X_eval = fitted
+    flat_forest = FlatForest.from_models([folded if use_folded else model])
+    assert np.array_equal(flat_forest.predict(X_eval)[:, 0], model.predict(X_eval))